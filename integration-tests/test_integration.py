@@ -1,8 +1,11 @@
+import os
 import requests
 
-KONG_PROXY_URL = "http://192.168.49.2:31579/graphql"
-ISSUES_URL = "http://192.168.49.2:31579/issues"
-BOOKMARK_URL = "http://192.168.49.2:31579/bookmark"
+# Minikube's Kong by default; KONG_URL=http://localhost:8080 targets the loadtest stack.
+KONG_URL = os.environ.get("KONG_URL", "http://192.168.49.2:31579").rstrip("/")
+KONG_PROXY_URL = f"{KONG_URL}/graphql"
+ISSUES_URL = f"{KONG_URL}/issues"
+BOOKMARK_URL = f"{KONG_URL}/bookmark"
 
 def test_user_authentication():
     """Test user registration, login, and token validation using GraphQL"""
@@ -0,0 +1,5 @@
+-- One database per service, as in production: issue-aggregator and
+-- bookmarks-and-progress both have a user_issues table.
+CREATE DATABASE issues;
+CREATE DATABASE bookmarks;
+CREATE DATABASE users;
@@ -0,0 +1,308 @@
+"""
+End-to-end load test of the docker-compose stack behind Kong.
+
+Brings up docker/docker-compose.yml with the loadtest overlay (Kong in front,
+the GitHub stub from server/tools behind, one database per service), seeds it
+with server/tools/synthetic_data.py, then drives a weighted mix of user
+journeys through Kong while ramping the number of concurrent virtual users:
+
+    login            login mutation on the user service
+    feed             issues(sort: LEAST_CROWDED), the landing page
+    filter           issuesByLabel for one of the common labels
+    bookmark         createBookmark for a random issue
+    update_progress  updateBookmark on one of the user's bookmarks
+    refresh          refreshIssues against the stub (weight 0 unless --mix sets it)
+
+Each stage reports throughput and p50/p95/p99 latency and error rate per
+operation, checked against the budgets in loadtest/slo.json. The highest
+concurrency where every operation met its budget is printed as the capacity.
+
+    python loadtest/run.py up --issues 20000 --users 2000
+    python loadtest/run.py run --stages 5:30,20:60,50:60 --report report.json
+    python loadtest/run.py down
+
+Needs Docker Compose v2 and `requests` on the host. Exits 1 if any stage
+breaches a budget, so the run can gate a CI job.
+"""
+import argparse
+import base64
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+COMPOSE = [
+    "docker", "compose",
+    "-f", str(ROOT / "docker" / "docker-compose.yml"),
+    "-f", str(ROOT / "loadtest" / "docker-compose.loadtest.yml"),
+]
+# docker-compose.yml reads these; they may not exist in a fresh checkout.
+ENV_FILES = [
+    ROOT / "server" / "microservices" / service / ".env"
+    for service in ("issue-aggregator", "user-management-and-authentication", "bookmarks-and-progress")
+]
+DATABASES = {
+    "--issue-db": "postgresql://myuser:mypassword@db:5432/issues",
+    "--bookmarks-db": "postgresql://myuser:mypassword@db:5432/bookmarks",
+    "--users-db": "postgresql://myuser:mypassword@db:5432/users",
+}
+SLO_FILE = ROOT / "loadtest" / "slo.json"
+DEFAULT_MIX = {"login": 10, "feed": 35, "filter": 25, "bookmark": 15, "update_progress": 15, "refresh": 0}
+# The most common labels in the synthetic data (see synthetic_data.LABEL_NAMES).
+FILTER_LABELS = ["good first issue", "help wanted", "bug", "enhancement", "documentation", "beginner"]
+PASSWORD = "loadtest-password"
+
+class VirtualUser:
+    """One simulated user: an HTTP session with its own account, token and bookmarks."""
+
+    def __init__(self, number: int, base_url: str, issue_ids: list, seed: int):
+        self.number = number
+        self.base_url = base_url
+        self.issue_ids = issue_ids
+        self.rng = random.Random(seed * 100003 + number)
+        self.session = requests.Session()
+        self.email = f"loadtest{number}@example.com"
+        self.user_id = None
+        self.bookmark_ids = []
+
+    def graphql(self, path: str, query: str, variables: dict = None) -> dict:
+        """POSTs a GraphQL request through Kong, raising on HTTP or GraphQL errors."""
+        response = self.session.post(f"{self.base_url}{path}", json={"query": query, "variables": variables or {}}, timeout=30)
+        response.raise_for_status()
+        body = response.json()
+        if body.get("errors"):
+            raise RuntimeError(body["errors"][0].get("message", "GraphQL error"))
+        return body["data"]
+
+    def setup(self) -> None:
+        """Registers the account if needed and logs in once so user_id is known."""
+        try:
+            self.graphql(
+                "/graphql",
+                "mutation($input: RegisterInput!) { register(input: $input) { id } }",
+                {"input": {"username": f"loadtest{self.number}", "email": self.email, "password": PASSWORD}},
+            )
+        except RuntimeError as error:
+            if "already registered" not in str(error):
+                raise
+        self.login()
+
+    def login(self) -> None:
+        data = self.graphql(
+            "/graphql",
+            "mutation($input: LoginInput!) { login(input: $input) { accessToken } }",
+            {"input": {"email": self.email, "password": PASSWORD}},
+        )
+        token = data["login"]["accessToken"]
+        self.session.headers["Authorization"] = f"Bearer {token}"
+        payload = token.split(".")[1]
+        self.user_id = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))["user_id"]
+
+    def feed(self) -> None:
+        self.graphql("/issues/graphql", "{ issues(sort: LEAST_CROWDED) { id title labels trackingCount } }")
+
+    def filter(self) -> None:
+        self.graphql(
+            "/issues/graphql",
+            "query($label: String!) { issuesByLabel(label: $label, sort: LEAST_CROWDED) { id title labels trackingCount } }",
+            {"label": self.rng.choice(FILTER_LABELS)},
+        )
+
+    def bookmark(self) -> None:
+        data = self.graphql(
+            "/bookmark/graphql",
+            "mutation($input: CreateBookmarkInput!) { createBookmark(input: $input) { id } }",
+            {"input": {"userId": self.user_id, "issueId": self.rng.choice(self.issue_ids), "status": "to_do"}},
+        )
+        self.bookmark_ids.append(data["createBookmark"]["id"])
+
+    def update_progress(self) -> None:
+        if not self.bookmark_ids:
+            return self.bookmark()
+        self.graphql(
+            "/bookmark/graphql",
+            "mutation($input: UpdateBookmarkInput!) { updateBookmark(input: $input) { id status } }",
+            {"input": {"id": self.rng.choice(self.bookmark_ids), "status": self.rng.choice(["in_progress", "completed"])}},
+        )
+
+    def refresh(self) -> None:
+        self.graphql("/issues/graphql", "mutation { refreshIssues }")
+
+def compose(*args: str) -> None:
+    subprocess.run([*COMPOSE, *args], check=True)
+
+def wait_until_ready(base_url: str, timeout: float = 180) -> None:
+    deadline = time.monotonic() + timeout
+    for path in ("/issues/", "/bookmark/", "/users/"):
+        while True:
+            try:
+                if requests.get(f"{base_url}{path}", timeout=5).status_code == 200:
+                    break
+            except requests.RequestException:
+                pass
+            if time.monotonic() > deadline:
+                sys.exit(f"{base_url}{path} did not come up within {timeout:.0f}s")
+            time.sleep(2)
+
+def up(args) -> None:
+    for env_file in ENV_FILES:
+        env_file.touch(exist_ok=True)
+    compose("up", "-d", "--build")
+    wait_until_ready(args.base_url)
+    if args.issues:
+        seed_args = [f"{flag}={url}" for flag, url in DATABASES.items()]
+        compose(
+            "exec", "-T", "issue-aggregator", "python", "/tools/synthetic_data.py", "--truncate",
+            f"--issues={args.issues}", f"--users={args.users}", f"--seed={args.seed}", *seed_args,
+        )
+    print(f"Stack is up behind {args.base_url}")
+
+def down(args) -> None:
+    compose("down", "--volumes")
+
+def parse_stages(value: str) -> list:
+    """'5:30,20:60' -> [(5, 30.0), (20, 60.0)]: concurrent users and seconds per stage."""
+    stages = []
+    for stage in value.split(","):
+        users, seconds = stage.split(":")
+        stages.append((int(users), float(seconds)))
+    return stages
+
+def parse_mix(value: str) -> dict:
+    """'feed=50,bookmark=10' overrides those weights and keeps the defaults for the rest."""
+    mix = dict(DEFAULT_MIX)
+    for item in filter(None, value.split(",")):
+        name, weight = item.split("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r}")
+        mix[name] = float(weight)
+    return mix
+
+def percentile(ordered: list, fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+def run_stage(users: list, seconds: float, mix: dict, think_ms: float) -> dict:
+    """Runs every user in a loop for `seconds`, returning (elapsed, ok) samples per operation."""
+    names = [name for name, weight in mix.items() if weight > 0]
+    weights = [mix[name] for name in names]
+    samples = {name: [] for name in names}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def loop(user: VirtualUser):
+        local = {name: [] for name in names}
+        while time.monotonic() < deadline:
+            name = user.rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                getattr(user, name)()
+                ok = True
+            except (requests.RequestException, RuntimeError, ValueError, KeyError):
+                ok = False
+            local[name].append((time.perf_counter() - start, ok))
+            if think_ms:
+                time.sleep(user.rng.expovariate(1000 / think_ms))
+        with lock:
+            for name, results in local.items():
+                samples[name].extend(results)
+
+    threads = [threading.Thread(target=loop, args=(user,), daemon=True) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples
+
+def summarise(samples: dict, seconds: float, slo: dict) -> dict:
+    summary = {}
+    for name, results in samples.items():
+        times = sorted(elapsed * 1000 for elapsed, _ in results)
+        errors = sum(not ok for _, ok in results)
+        stats = {
+            "requests": len(results),
+            "rps": round(len(results) / seconds, 2),
+            "p50_ms": round(percentile(times, 0.50), 1),
+            "p95_ms": round(percentile(times, 0.95), 1),
+            "p99_ms": round(percentile(times, 0.99), 1),
+            "error_rate": round(errors / len(results), 4) if results else 0.0,
+        }
+        budget = slo.get(name)
+        stats["breaches"] = [] if not budget else [
+            key for key, limit in (("p95_ms", budget["p95_ms"]), ("p99_ms", budget["p99_ms"]), ("error_rate", budget["max_error_rate"]))
+            if stats[key] > limit
+        ]
+        summary[name] = stats
+    return summary
+
+def print_stage(users: int, summary: dict) -> None:
+    print(f"\n{users} concurrent users")
+    print(f"{'operation':<18}{'requests':>10}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'errors':>9}  SLO")
+    for name, stats in summary.items():
+        verdict = "breach: " + ", ".join(stats["breaches"]) if stats["breaches"] else "ok"
+        print(
+            f"{name:<18}{stats['requests']:>10}{stats['rps']:>9.1f}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}"
+            f"{stats['p99_ms']:>9.1f}{stats['error_rate']:>9.2%}  {verdict}"
+        )
+
+def run(args) -> int:
+    slo = json.loads(Path(args.slo).read_text())
+    stages = args.stages
+    print(f"Preparing {max(users for users, _ in stages)} virtual users against {args.base_url}")
+    probe = VirtualUser(0, args.base_url, [], args.seed)
+    issue_ids = [issue["id"] for issue in probe.graphql("/issues/graphql", "{ issues { id } }")["issues"]]
+    if not issue_ids:
+        sys.exit("No issues to bookmark: seed the stack with `run.py up --issues N` first")
+    users = [VirtualUser(n, args.base_url, issue_ids, args.seed) for n in range(1, max(u for u, _ in stages) + 1)]
+    for user in users:
+        user.setup()
+
+    report = {"base_url": args.base_url, "mix": args.mix, "slo": slo, "stages": []}
+    capacity = 0
+    for concurrency, seconds in stages:
+        summary = summarise(run_stage(users[:concurrency], seconds, args.mix, args.think_ms), seconds, slo)
+        print_stage(concurrency, summary)
+        passed = not any(stats["breaches"] for stats in summary.values())
+        capacity = concurrency if passed and concurrency > capacity else capacity
+        report["stages"].append({"users": concurrency, "seconds": seconds, "passed": passed, "operations": summary})
+
+    report["capacity"] = capacity
+    print(f"\nCapacity within SLO: {capacity} concurrent users" if capacity else "\nNo stage met every SLO")
+    if args.report:
+        Path(args.report).write_text(json.dumps(report, indent=2))
+    return 0 if all(stage["passed"] for stage in report["stages"]) else 1
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", default=os.environ.get("KONG_URL", "http://localhost:8080"))
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    up_parser = commands.add_parser("up", help="build, start and seed the stack")
+    up_parser.add_argument("--issues", type=int, default=20000, help="synthetic issues to load; 0 skips seeding")
+    up_parser.add_argument("--users", type=int, default=2000)
+    up_parser.add_argument("--seed", type=int, default=42)
+    up_parser.set_defaults(handler=up)
+
+    down_parser = commands.add_parser("down", help="stop the stack and drop its volumes")
+    down_parser.set_defaults(handler=down)
+
+    run_parser = commands.add_parser("run", help="run the load test")
+    run_parser.add_argument("--stages", type=parse_stages, default=parse_stages("5:30,20:60,50:60"),
+                            help="users:seconds per stage, comma-separated")
+    run_parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX), help="e.g. feed=50,refresh=1")
+    run_parser.add_argument("--think-ms", type=float, default=0, help="mean pause between a user's requests")
+    run_parser.add_argument("--slo", default=str(SLO_FILE))
+    run_parser.add_argument("--report", help="write the results as JSON to this file")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.set_defaults(handler=run)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args) or 0)
+
+if __name__ == "__main__":
+    main()
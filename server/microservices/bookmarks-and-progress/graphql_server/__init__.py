@@ -1,26 +1,36 @@
 # graphql_server/__init__.py
 import strawberry
-from strawberry.fastapi import GraphQLRouter
 from fastapi import Request
 from models.database import SessionLocal
-from graphql_server.schemas.bookmark_schema import Bookmark
+from observability.metrics import MetricsExtension
+from observability.tracing import tracing_extensions
+from observability.server_timing import ServerTimingExtension, TimedGraphQLRouter
+from observability.query_budget import query_budget_extensions
+from graphql_server.loaders import create_issue_loader
+from graphql_server.schemas.bookmark_schema import Bookmark, BookmarkResult
+from graphql_server.schemas.progress_schema import ProgressSummary
 from graphql_server.resolvers.bookmark_resolver import BookmarkQueryResolver, BookmarkMutationResolver
+from graphql_server.resolvers.progress_resolver import ProgressQueryResolver
 
 async def get_context(request: Request):
     db = SessionLocal()
     user_id = getattr(request.state, "user_id", None)  # Set by auth middleware
-    return {"request": request, "db": db, "user_id": user_id}
+    return {"request": request, "db": db, "user_id": user_id, "issue_loader": create_issue_loader()}
 
 @strawberry.type
 class Query:
     get_bookmarks: list[Bookmark] = strawberry.field(resolver=BookmarkQueryResolver.get_bookmarks)
+    progress_summary: ProgressSummary = strawberry.field(resolver=ProgressQueryResolver.progress_summary)
 
 @strawberry.type
 class Mutation:
     create_bookmark: Bookmark = strawberry.mutation(resolver=BookmarkMutationResolver.create_bookmark)
     update_bookmark: Bookmark = strawberry.mutation(resolver=BookmarkMutationResolver.update_bookmark)
     delete_bookmark: Bookmark = strawberry.mutation(resolver=BookmarkMutationResolver.delete_bookmark)
+    create_bookmarks: list[BookmarkResult] = strawberry.mutation(resolver=BookmarkMutationResolver.create_bookmarks)
+    update_bookmarks: list[BookmarkResult] = strawberry.mutation(resolver=BookmarkMutationResolver.update_bookmarks)
+    delete_bookmarks: list[BookmarkResult] = strawberry.mutation(resolver=BookmarkMutationResolver.delete_bookmarks)
 
-schema = strawberry.Schema(query=Query, mutation=Mutation)
-graphql_app = GraphQLRouter(schema, context_getter=get_context)
+schema = strawberry.Schema(query=Query, mutation=Mutation, extensions=[MetricsExtension, ServerTimingExtension, *query_budget_extensions(), *tracing_extensions()])
+graphql_app = TimedGraphQLRouter(schema, context_getter=get_context)
 
@@ -0,0 +1,34 @@
+# graphql_server/loaders.py
+import asyncio
+from datetime import datetime
+from typing import Optional
+from strawberry.dataloader import DataLoader
+from graphql_server.schemas.issue_schema import Issue
+from integrations.issue_aggregator import fetch_issues_by_ids
+
+def parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+def map_issue(data: dict) -> Issue:
+    return Issue(
+        id=data["id"],
+        title=data["title"],
+        description=data.get("description"),
+        state=data["state"],
+        url=data.get("url"),
+        source=data.get("source"),
+        labels=data.get("labels") or [],
+        repository_id=data.get("repositoryId"),
+        created_at=parse_datetime(data.get("createdAt")),
+        updated_at=parse_datetime(data.get("updatedAt")),
+    )
+
+async def load_issues(ids: list[int]) -> list[Optional[Issue]]:
+    # The DataLoader collects every Bookmark.issue on the page into one call;
+    # requests is blocking, so keep it off the event loop.
+    issues = await asyncio.to_thread(fetch_issues_by_ids, list(ids))
+    return [map_issue(issue) if issue else None for issue in issues]
+
+def create_issue_loader() -> DataLoader[int, Optional[Issue]]:
+    """One loader per request, so batching and memoization stay request-scoped."""
+    return DataLoader(load_fn=load_issues)
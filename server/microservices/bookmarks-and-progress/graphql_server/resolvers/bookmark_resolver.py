@@ -1,111 +1,253 @@
 # graphql_server/resolvers/bookmark_resolver.py
+import base64
 import datetime
+from collections import Counter
+from typing import Optional
+from sqlalchemy import tuple_, update, delete
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 import strawberry
+from models.database import dialect_insert
 from models.models import UserIssue, ProgressStatus
+from services.progress_service import apply_status_deltas
 from graphql_server.schemas.bookmark_schema import (
     Bookmark, 
+    BookmarkOrderBy,
+    BookmarkResult,
     CreateBookmarkInput, 
     UpdateBookmarkInput, 
     ProgressStatusEnum
 )
 
+MAX_PAGE_SIZE = 100
+
+def encode_cursor(user_issue: UserIssue) -> str:
+    raw = f"{user_issue.updated_at.isoformat()}|{user_issue.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str) -> tuple[datetime.datetime, int]:
+    try:
+        updated_at, _, id_ = base64.urlsafe_b64decode(cursor.encode()).decode().partition("|")
+        return datetime.datetime.fromisoformat(updated_at), int(id_)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def map_bookmark(user_issue: UserIssue) -> Bookmark:
+    return Bookmark(
+        id=user_issue.id,
+        user_id=user_issue.user_id,
+        issue_id=user_issue.issue_id,
+        status=user_issue.status.value,
+        pr_link=user_issue.pr_link,
+        created_at=user_issue.created_at,
+        updated_at=user_issue.updated_at,
+        cursor=encode_cursor(user_issue),
+    )
+
 @strawberry.type
 class BookmarkQueryResolver:
     @strawberry.field
-    def get_bookmarks(self, info) -> list[Bookmark]:
+    def get_bookmarks(
+        self,
+        info,
+        status: Optional[ProgressStatusEnum] = None,
+        first: Optional[int] = None,
+        after: Optional[str] = None,
+        order_by: BookmarkOrderBy = BookmarkOrderBy.updated_at_desc,
+    ) -> list[Bookmark]:
         db: Session = info.context["db"]
         user_id = info.context.get("user_id")
         if not user_id:
             raise HTTPException(status_code=401, detail="Not authenticated")
-        user_issues = db.query(UserIssue).filter(UserIssue.user_id == user_id).all()
-        return [
-            Bookmark(
-                id=issue.id,
-                user_id=issue.user_id,
-                issue_id=issue.issue_id,
-                status=issue.status.value,
-                pr_link=issue.pr_link,
-                created_at=issue.created_at,
-                updated_at=issue.updated_at
-            )
-            for issue in user_issues
-        ]
+        # Every branch below keeps the query a range scan on
+        # ix_user_issue_status_updated / ix_user_issue_updated, so a page costs
+        # the same no matter how many bookmarks the user has.
+        query = db.query(UserIssue).filter(UserIssue.user_id == user_id)
+        if status is not None:
+            query = query.filter(UserIssue.status == ProgressStatus(status.value))
+        keyset = tuple_(UserIssue.updated_at, UserIssue.id)
+        descending = order_by == BookmarkOrderBy.updated_at_desc
+        if after is not None:
+            position = decode_cursor(after)
+            query = query.filter(keyset < position if descending else keyset > position)
+        if descending:
+            query = query.order_by(UserIssue.updated_at.desc(), UserIssue.id.desc())
+        else:
+            query = query.order_by(UserIssue.updated_at.asc(), UserIssue.id.asc())
+        if first is not None:
+            if first < 1:
+                raise HTTPException(status_code=400, detail="first must be a positive integer")
+            query = query.limit(min(first, MAX_PAGE_SIZE))
+        return [map_bookmark(issue) for issue in query.all()]
+
+def insert_bookmarks(db: Session, inputs: list[CreateBookmarkInput]) -> list[BookmarkResult]:
+    """
+    Inserts all bookmarks with a single INSERT ... ON CONFLICT (user_id, issue_id) DO NOTHING.
+    Rows that already exist (or repeat within the batch) come back as per-item errors.
+    Does not commit.
+    """
+    now = datetime.datetime.utcnow()
+    rows = {}
+    for item in inputs:
+        rows.setdefault((item.user_id, item.issue_id), dict(
+            user_id=item.user_id,
+            issue_id=item.issue_id,
+            status=ProgressStatus(item.status),
+            pr_link=item.pr_link,
+            created_at=now,
+            updated_at=now,
+        ))
+    inserted = {}
+    if rows:
+        stmt = (
+            dialect_insert(db)(UserIssue)
+            .values(list(rows.values()))
+            .on_conflict_do_nothing(index_elements=["user_id", "issue_id"])
+            .returning(UserIssue)
+        )
+        inserted = {(row.user_id, row.issue_id): row for row in db.scalars(stmt)}
+        apply_status_deltas(db, Counter((row.user_id, row.issue_id, row.status) for row in inserted.values()))
+
+    results = []
+    for item in inputs:
+        row = inserted.pop((item.user_id, item.issue_id), None)
+        if row is None:
+            results.append(BookmarkResult(ok=False, error="Bookmark already exists"))
+        else:
+            results.append(BookmarkResult(ok=True, bookmark=map_bookmark(row)))
+    return results
+
+def update_bookmarks(db: Session, inputs: list[UpdateBookmarkInput]) -> list[BookmarkResult]:
+    """
+    Loads the targeted rows with one SELECT, then issues one UPDATE per distinct
+    (status, pr_link) change, so "move all to completed" is a single statement.
+    Does not commit.
+    """
+    ids = {item.id for item in inputs}
+    existing = {
+        row.id: row
+        for row in db.query(UserIssue).filter(UserIssue.id.in_(ids)).with_for_update()
+    } if ids else {}
+
+    now = datetime.datetime.utcnow()
+    outcomes = []
+    changes = {}
+    seen = set()
+    deltas = Counter()
+    for item in inputs:
+        row = existing.get(item.id)
+        if row is None:
+            outcomes.append(BookmarkResult(ok=False, error="Bookmark not found"))
+            continue
+        if item.id in seen:
+            outcomes.append(BookmarkResult(ok=False, error="Bookmark updated more than once in this request"))
+            continue
+        seen.add(item.id)
+        values = {"updated_at": now}
+        if item.status is not None:
+            values["status"] = ProgressStatus(item.status)
+            deltas[(row.user_id, row.issue_id, row.status)] -= 1
+            deltas[(row.user_id, row.issue_id, values["status"])] += 1
+        if item.pr_link is not None:
+            values["pr_link"] = item.pr_link
+        changes.setdefault(tuple(sorted(values.items(), key=lambda kv: kv[0])), set()).add(item.id)
+        outcomes.append(row)
+    for values, group_ids in changes.items():
+        db.execute(
+            update(UserIssue)
+            .where(UserIssue.id.in_(group_ids))
+            .values(dict(values))
+            .execution_options(synchronize_session="evaluate")
+        )
+    apply_status_deltas(db, deltas)
+
+    return [
+        outcome if isinstance(outcome, BookmarkResult) else BookmarkResult(ok=True, bookmark=map_bookmark(outcome))
+        for outcome in outcomes
+    ]
+
+def delete_bookmarks(db: Session, ids: list[int]) -> list[BookmarkResult]:
+    """
+    Deletes all bookmarks with a single DELETE ... RETURNING.
+    Does not commit.
+    """
+    deleted = {}
+    if ids:
+        stmt = delete(UserIssue).where(UserIssue.id.in_(set(ids))).returning(UserIssue)
+        rows = db.scalars(stmt).all()
+        deleted = {row.id: map_bookmark(row) for row in rows}
+        deltas = Counter()
+        deltas.subtract((row.user_id, row.issue_id, row.status) for row in rows)
+        apply_status_deltas(db, deltas)
+    return [
+        BookmarkResult(ok=True, bookmark=deleted.pop(id))
+        if id in deleted
+        else BookmarkResult(ok=False, error="Bookmark not found")
+        for id in ids
+    ]
 
 @strawberry.type
 class BookmarkMutationResolver:
     @strawberry.mutation
     def create_bookmark(self, info, input: CreateBookmarkInput) -> Bookmark:
         db: Session = info.context["db"]
-        # Prevent duplicate bookmarks
-        existing = db.query(UserIssue).filter(
-            UserIssue.user_id == input.user_id,
-            UserIssue.issue_id == input.issue_id
-        ).first()
-        if existing:
-            raise HTTPException(status_code=400, detail="Bookmark already exists")
-        new_bookmark = UserIssue(
-            user_id=input.user_id,
-            issue_id=input.issue_id,
-            status=ProgressStatus(input.status),
-            pr_link=input.pr_link,
-            created_at=datetime.datetime.utcnow(),
-            updated_at=datetime.datetime.utcnow()
-        )
-        db.add(new_bookmark)
+        # ON CONFLICT replaces the old SELECT-then-INSERT duplicate check.
+        [result] = insert_bookmarks(db, [input])
+        if not result.ok:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=result.error)
         db.commit()
-        db.refresh(new_bookmark)
-        return Bookmark(
-            id=new_bookmark.id,
-            user_id=new_bookmark.user_id,
-            issue_id=new_bookmark.issue_id,
-            status=new_bookmark.status.value,
-            pr_link=new_bookmark.pr_link,
-            created_at=new_bookmark.created_at,
-            updated_at=new_bookmark.updated_at
-        )
+        return result.bookmark
 
     @strawberry.mutation
     def update_bookmark(self, info, input: UpdateBookmarkInput) -> Bookmark:
         db: Session = info.context["db"]
-        bookmark = db.query(UserIssue).filter(UserIssue.id == input.id).first()
-        if not bookmark:
-            raise HTTPException(status_code=404, detail="Bookmark not found")
-        if input.status is not None:
-            bookmark.status = ProgressStatus(input.status)
-        if input.pr_link is not None:
-            bookmark.pr_link = input.pr_link
-        bookmark.updated_at = datetime.datetime.utcnow()
+        [result] = update_bookmarks(db, [input])
+        if not result.ok:
+            db.rollback()
+            raise HTTPException(status_code=404, detail=result.error)
         db.commit()
-        db.refresh(bookmark)
-        return Bookmark(
-            id=bookmark.id,
-            user_id=bookmark.user_id,
-            issue_id=bookmark.issue_id,
-            status=bookmark.status.value,
-            pr_link=bookmark.pr_link,
-            created_at=bookmark.created_at,
-            updated_at=bookmark.updated_at
-        )
+        return result.bookmark
 
     @strawberry.mutation
     def delete_bookmark(self, info, id: int) -> Bookmark:
         db: Session = info.context["db"]
-        bookmark = db.query(UserIssue).filter(UserIssue.id == id).first()
-        if not bookmark:
-            raise HTTPException(status_code=404, detail="Bookmark not found")
-        # Capture details before deletion
-        deleted_bookmark = Bookmark(
-            id=bookmark.id,
-            user_id=bookmark.user_id,
-            issue_id=bookmark.issue_id,
-            status=bookmark.status.value,
-            pr_link=bookmark.pr_link,
-            created_at=bookmark.created_at,
-            updated_at=bookmark.updated_at
-        )
-        db.delete(bookmark)
+        [result] = delete_bookmarks(db, [id])
+        if not result.ok:
+            db.rollback()
+            raise HTTPException(status_code=404, detail=result.error)
         db.commit()
-        return deleted_bookmark
+        return result.bookmark
+
+    @strawberry.mutation
+    def create_bookmarks(self, info, input: list[CreateBookmarkInput]) -> list[BookmarkResult]:
+        db: Session = info.context["db"]
+        try:
+            results = insert_bookmarks(db, input)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return results
+
+    @strawberry.mutation
+    def update_bookmarks(self, info, input: list[UpdateBookmarkInput]) -> list[BookmarkResult]:
+        db: Session = info.context["db"]
+        try:
+            results = update_bookmarks(db, input)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return results
 
+    @strawberry.mutation
+    def delete_bookmarks(self, info, ids: list[int]) -> list[BookmarkResult]:
+        db: Session = info.context["db"]
+        try:
+            results = delete_bookmarks(db, ids)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return results
@@ -0,0 +1,15 @@
+# graphql_server/resolvers/progress_resolver.py
+from sqlalchemy.orm import Session
+import strawberry
+from graphql_server.schemas.progress_schema import ProgressSummary
+from services.progress_service import get_progress
+
+@strawberry.type
+class ProgressQueryResolver:
+    @strawberry.field
+    def progress_summary(self, info, user_id: int) -> ProgressSummary:
+        # Served from the user_progress counters: one primary-key lookup
+        # regardless of how many bookmarks the user has.
+        db: Session = info.context["db"]
+        counts = get_progress(db, user_id)
+        return ProgressSummary(user_id=user_id, total=sum(counts.values()), **counts)
@@ -3,6 +3,7 @@ import strawberry
 from datetime import datetime
 from typing import Optional
 from enum import Enum
+from graphql_server.schemas.issue_schema import Issue
 
 class ProgressStatusEnum(str, Enum):
     to_do = "to_do"
@@ -10,6 +11,10 @@ class ProgressStatusEnum(str, Enum):
     completed = "completed"
     dropped = "dropped"
 
+class BookmarkOrderBy(str, Enum):
+    updated_at_desc = "updated_at_desc"
+    updated_at_asc = "updated_at_asc"
+
 @strawberry.type
 class Bookmark:
     id: int
@@ -19,6 +24,20 @@ class Bookmark:
     pr_link: Optional[str]
     created_at: datetime
     updated_at: datetime
+    # Opaque keyset cursor; pass it as `after` to get_bookmarks to fetch the next page.
+    cursor: Optional[str] = None
+
+    @strawberry.field
+    async def issue(self, info: strawberry.Info) -> Optional[Issue]:
+        # Batched across the whole page by the request's issue loader.
+        return await info.context["issue_loader"].load(self.issue_id)
+
+@strawberry.type
+class BookmarkResult:
+    """Per-item outcome of a batch bookmark mutation, in input order."""
+    ok: bool
+    bookmark: Optional[Bookmark] = None
+    error: Optional[str] = None
 
 @strawberry.input
 class CreateBookmarkInput:
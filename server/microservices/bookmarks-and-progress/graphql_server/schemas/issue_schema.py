@@ -0,0 +1,18 @@
+# graphql_server/schemas/issue_schema.py
+import strawberry
+from datetime import datetime
+from typing import Optional
+
+@strawberry.type
+class Issue:
+    """An aggregated issue as served by the issue-aggregator's issuesByIds query."""
+    id: int
+    title: str
+    description: Optional[str]
+    state: str
+    url: Optional[str]
+    source: Optional[str]
+    labels: list[str]
+    repository_id: Optional[int]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
@@ -0,0 +1,11 @@
+# graphql_server/schemas/progress_schema.py
+import strawberry
+
+@strawberry.type
+class ProgressSummary:
+    user_id: int
+    to_do: int
+    in_progress: int
+    completed: int
+    dropped: int
+    total: int
@@ -0,0 +1,135 @@
+# integrations/issue_aggregator.py
+"""
+Client for the issue-aggregator: the `issuesByIds` query used to hydrate
+bookmarks and the `upsertIssueStats` mutation that receives popularity counters.
+
+Issues change only when the aggregator refreshes, so results are kept in a small
+process-local cache with a short TTL. Repeated page loads then skip the network
+entirely, and a cold page of up to MAX_IDS_PER_REQUEST issues costs one HTTP call.
+"""
+import os
+import threading
+import time
+from typing import Optional
+import requests
+from observability.metrics import record_upstream_call
+from observability.tracing import client_span, record_response
+
+ISSUE_AGGREGATOR_URL = os.environ.get("ISSUE_AGGREGATOR_URL", "http://issue-aggregator:8000/graphql")
+ISSUE_CACHE_TTL_SECONDS = float(os.environ.get("ISSUE_CACHE_TTL_SECONDS", "30"))
+ISSUE_CACHE_MAX_ENTRIES = int(os.environ.get("ISSUE_CACHE_MAX_ENTRIES", "10000"))
+STATS_PUSH_TOKEN = os.environ.get("STATS_PUSH_TOKEN")
+REQUEST_TIMEOUT_SECONDS = 5
+# Matches MAX_IDS_PER_LOOKUP in the issue-aggregator.
+MAX_IDS_PER_REQUEST = 500
+
+ISSUES_BY_IDS_QUERY = """
+query($ids: [Int!]!) {
+  issuesByIds(ids: $ids) {
+    id
+    title
+    description
+    state
+    url
+    source
+    labels
+    repositoryId
+    createdAt
+    updatedAt
+  }
+}
+"""
+
+UPSERT_ISSUE_STATS_MUTATION = """
+mutation($stats: [IssueStatsInput!]!) {
+  upsertIssueStats(stats: $stats)
+}
+"""
+
+class TTLCache:
+    """A tiny thread-safe TTL cache; entries are evicted oldest-first when full."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, keys) -> dict:
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] > now:
+                    found[key] = entry[1]
+        return found
+
+    def set_many(self, items: dict) -> None:
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for key, value in items.items():
+                self._entries.pop(key, None)
+                self._entries[key] = (expires_at, value)
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+issue_cache = TTLCache(ISSUE_CACHE_TTL_SECONDS, ISSUE_CACHE_MAX_ENTRIES)
+
+def _post(endpoint: str, headers: Optional[dict] = None, **kwargs) -> requests.Response:
+    """
+    POSTs to the aggregator, recording latency and status under `endpoint` and
+    forwarding the trace context so the aggregator's spans join this trace.
+    """
+    headers = dict(headers or {})
+    with client_span("issue-aggregator", endpoint, "POST", ISSUE_AGGREGATOR_URL, headers) as span:
+        start = time.perf_counter()
+        response = None
+        try:
+            response = requests.post(ISSUE_AGGREGATOR_URL, headers=headers, timeout=REQUEST_TIMEOUT_SECONDS, **kwargs)
+            return response
+        finally:
+            record_upstream_call("issue-aggregator", endpoint, response, time.perf_counter() - start)
+            record_response(span, response)
+
+def fetch_issues_by_ids(ids: list[int]) -> list[Optional[dict]]:
+    """
+    Returns the aggregator's issue dicts in the order of `ids` (None where the
+    issue no longer exists). Only cache misses go over the network, in one call.
+    """
+    cached = issue_cache.get_many(ids)
+    missing = [id for id in dict.fromkeys(ids) if id not in cached]
+    for start in range(0, len(missing), MAX_IDS_PER_REQUEST):
+        batch = missing[start:start + MAX_IDS_PER_REQUEST]
+        response = _post("issuesByIds", json={"query": ISSUES_BY_IDS_QUERY, "variables": {"ids": batch}})
+        if response.status_code != 200:
+            raise Exception(f"Query failed with status {response.status_code}: {response.text}")
+        payload = response.json()
+        if payload.get("errors"):
+            raise Exception(f"issuesByIds failed: {payload['errors']}")
+        fetched = dict(zip(batch, payload["data"]["issuesByIds"]))
+        issue_cache.set_many(fetched)
+        cached.update(fetched)
+    return [cached.get(id) for id in ids]
+
+def push_issue_stats(stats: list[dict]) -> int:
+    """
+    Sends a batch of per-issue counters ({issueId, toDo, inProgress, completed,
+    dropped}) in one upsertIssueStats call. Returns the number of rows stored.
+    """
+    headers = {"X-Stats-Token": STATS_PUSH_TOKEN} if STATS_PUSH_TOKEN else {}
+    response = _post(
+        "upsertIssueStats",
+        json={"query": UPSERT_ISSUE_STATS_MUTATION, "variables": {"stats": stats}},
+        headers=headers,
+    )
+    if response.status_code != 200:
+        raise Exception(f"Query failed with status {response.status_code}: {response.text}")
+    payload = response.json()
+    if payload.get("errors"):
+        raise Exception(f"upsertIssueStats failed: {payload['errors']}")
+    return payload["data"]["upsertIssueStats"]
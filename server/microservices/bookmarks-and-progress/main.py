@@ -9,13 +9,29 @@ DATABASE_URL = os.getenv("BOOKMARKS_DB_URL", "sqlite:///./test.db")
 
 from fastapi import FastAPI
 from graphql_server import graphql_app
+from models.database import engine
+from observability.metrics import instrument_engine, metrics_endpoint
+from observability.tracing import setup_tracing
+from observability.server_timing import instrument_engine_timing
+from observability.query_budget import instrument_engine_budget
+from observability.slow_queries import instrument_engine_slow_queries
+from observability.admin import ProfileRequestMiddleware, router as admin_router
+
+instrument_engine(engine)
+instrument_engine_timing(engine)
+instrument_engine_budget(engine)
+instrument_engine_slow_queries(engine)
 
 app = FastAPI()
+setup_tracing(app, engine, "bookmarking")
+app.add_middleware(ProfileRequestMiddleware)
 
 @app.get("/")
 def read_root():
     return {"message": "Bookmarking service is up!"}
 
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+app.include_router(admin_router)
 app.include_router(graphql_app, prefix="/graphql")
 
 if __name__ == "__main__":
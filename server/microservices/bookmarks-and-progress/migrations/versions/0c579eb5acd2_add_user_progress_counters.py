@@ -0,0 +1,47 @@
+"""add user progress counters
+
+Revision ID: 0c579eb5acd2
+Revises: 294f725efb28
+Create Date: 2026-10-19 10:03:17.284915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c579eb5acd2'
+down_revision: Union[str, None] = '294f725efb28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user_progress',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('to_do', sa.Integer(), nullable=False),
+    sa.Column('in_progress', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Integer(), nullable=False),
+    sa.Column('dropped', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    # Backfill from existing bookmarks; afterwards the mutations keep it current.
+    op.execute("""
+        INSERT INTO user_progress (user_id, to_do, in_progress, completed, dropped, updated_at)
+        SELECT user_id,
+               SUM(CASE WHEN status = 'to_do' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN status = 'in_progress' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN status = 'dropped' THEN 1 ELSE 0 END),
+               CURRENT_TIMESTAMP
+        FROM user_issues
+        WHERE user_id IS NOT NULL
+        GROUP BY user_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('user_progress')
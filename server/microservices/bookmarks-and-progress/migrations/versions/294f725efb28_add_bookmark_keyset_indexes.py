@@ -0,0 +1,28 @@
+"""add bookmark keyset indexes
+
+Revision ID: 294f725efb28
+Revises: 844425c230e8
+Create Date: 2026-10-19 09:12:41.503217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '294f725efb28'
+down_revision: Union[str, None] = '844425c230e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_user_issue_status_updated', 'user_issues', ['user_id', 'status', 'updated_at', 'id'], unique=False)
+    op.create_index('ix_user_issue_updated', 'user_issues', ['user_id', 'updated_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_issue_updated', table_name='user_issues')
+    op.drop_index('ix_user_issue_status_updated', table_name='user_issues')
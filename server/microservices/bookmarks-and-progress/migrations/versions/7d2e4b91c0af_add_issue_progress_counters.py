@@ -0,0 +1,51 @@
+"""add issue progress counters
+
+Revision ID: 7d2e4b91c0af
+Revises: 0c579eb5acd2
+Create Date: 2026-10-19 11:26:52.618403
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2e4b91c0af'
+down_revision: Union[str, None] = '0c579eb5acd2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('issue_progress',
+    sa.Column('issue_id', sa.Integer(), nullable=False),
+    sa.Column('to_do', sa.Integer(), nullable=False),
+    sa.Column('in_progress', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Integer(), nullable=False),
+    sa.Column('dropped', sa.Integer(), nullable=False),
+    sa.Column('dirty', sa.Boolean(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('issue_id')
+    )
+    op.create_index(op.f('ix_issue_progress_dirty'), 'issue_progress', ['dirty'], unique=False)
+    # Backfill from existing bookmarks, all dirty so the first push ships them.
+    op.execute("""
+        INSERT INTO issue_progress (issue_id, to_do, in_progress, completed, dropped, dirty, updated_at)
+        SELECT issue_id,
+               SUM(CASE WHEN status = 'to_do' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN status = 'in_progress' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN status = 'dropped' THEN 1 ELSE 0 END),
+               TRUE,
+               CURRENT_TIMESTAMP
+        FROM user_issues
+        WHERE issue_id IS NOT NULL
+        GROUP BY issue_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_issue_progress_dirty'), table_name='issue_progress')
+    op.drop_table('issue_progress')
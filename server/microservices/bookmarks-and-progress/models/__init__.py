@@ -1,5 +1,5 @@
 from . import models, database
-from .models import UserIssue, ProgressStatus
+from .models import UserIssue, ProgressStatus, UserProgress, IssueProgress
 from .database import Base
 # This will create the `bookmarks` table in the database
 
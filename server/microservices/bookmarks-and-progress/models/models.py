@@ -1,7 +1,7 @@
 # models/models.py
 import datetime
 import enum
-from sqlalchemy import Column, Integer, String, DateTime, Enum, Index
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Index, Boolean
 from sqlalchemy.orm import relationship
 from models.database import Base
 
@@ -24,8 +24,48 @@ class UserIssue(Base):
 
     __table_args__ = (
          Index('ix_user_issue', "user_id", "issue_id", unique=True),
+         # Keyset pagination for get_bookmarks: filtered by status, or across all statuses.
+         Index('ix_user_issue_status_updated', "user_id", "status", "updated_at", "id"),
+         Index('ix_user_issue_updated', "user_id", "updated_at", "id"),
     )
 
     def __repr__(self):
         return f"<UserIssue(id={self.id}, user_id={self.user_id}, issue_id={self.issue_id}, status='{self.status.value}')>"
 
+
+class UserProgress(Base):
+    """
+    Per-user bookmark counts by status. Maintained incrementally by the bookmark
+    mutations (in the same transaction) and rebuilt by services.progress_service.
+    """
+    __tablename__ = "user_progress"
+
+    user_id = Column(Integer, primary_key=True)
+    to_do = Column(Integer, default=0, nullable=False)
+    in_progress = Column(Integer, default=0, nullable=False)
+    completed = Column(Integer, default=0, nullable=False)
+    dropped = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    def __repr__(self):
+        return f"<UserProgress(user_id={self.user_id}, to_do={self.to_do}, in_progress={self.in_progress}, completed={self.completed}, dropped={self.dropped})>"
+
+
+class IssueProgress(Base):
+    """
+    Per-issue bookmark counts by status: how many users are working on each issue.
+    Maintained alongside UserProgress; rows flagged `dirty` are pushed to the
+    issue-aggregator's issue_stats table by services.progress_service.
+    """
+    __tablename__ = "issue_progress"
+
+    issue_id = Column(Integer, primary_key=True)
+    to_do = Column(Integer, default=0, nullable=False)
+    in_progress = Column(Integer, default=0, nullable=False)
+    completed = Column(Integer, default=0, nullable=False)
+    dropped = Column(Integer, default=0, nullable=False)
+    dirty = Column(Boolean, default=True, nullable=False, index=True)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    def __repr__(self):
+        return f"<IssueProgress(issue_id={self.issue_id}, in_progress={self.in_progress}, dirty={self.dirty})>"
@@ -0,0 +1,91 @@
+"""
+Admin endpoints for diagnosing a live service, mounted under /admin.
+
+Every route needs an `X-Admin-Token` header matching ADMIN_TOKEN. Without
+ADMIN_TOKEN set the routes answer 404, so they are off unless configured.
+
+- GET /admin/slow-queries: recent slow SQL statements and their plans.
+- GET /admin/profile?seconds=10: CPU profile of the whole process, as
+  collapsed stacks for a flamegraph.
+- Any request sent with `X-Profile: 1` (and the admin token) is profiled on
+  its own; the collapsed stacks replace its response body and the original
+  status is returned in `X-Profiled-Status`.
+"""
+import asyncio
+import hmac
+import os
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from observability.profiler import MAX_PROFILE_SECONDS, PROFILE_INTERVAL_MS, Sampler, profile_lock
+from observability.slow_queries import slow_query_log
+
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+
+def admin_token_valid(token: str) -> bool:
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode())
+
+def require_admin_token(request: Request) -> None:
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not admin_token_valid(request.headers.get("X-Admin-Token", "")):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+router = APIRouter(prefix="/admin", include_in_schema=False, dependencies=[Depends(require_admin_token)])
+
+@router.get("/slow-queries")
+def slow_queries(limit: int = 100):
+    """The slowest recent statements, newest first, with their plans where sampled."""
+    return {"queries": slow_query_log.snapshot()[:limit]}
+
+@router.get("/profile")
+async def profile(seconds: float = 10, interval_ms: float = PROFILE_INTERVAL_MS):
+    """Samples every thread for `seconds` and returns the collapsed stacks."""
+    if not 0 < seconds <= MAX_PROFILE_SECONDS or interval_ms < 1:
+        raise HTTPException(status_code=400, detail=f"seconds must be in (0, {MAX_PROFILE_SECONDS}], interval_ms >= 1")
+    if not profile_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    try:
+        sampler = Sampler(interval_ms / 1000).start()
+        # Sleeping keeps the event loop free, so the profile shows the traffic being served.
+        await asyncio.sleep(seconds)
+        sampler.stop()
+    finally:
+        profile_lock.release()
+    return PlainTextResponse(sampler.collapsed(), headers={"X-Profile-Samples": str(sampler.samples)})
+
+class ProfileRequestMiddleware:
+    """ASGI middleware that profiles single requests marked with `X-Profile`."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = {key.decode("latin-1").lower(): value.decode("latin-1") for key, value in scope["headers"]}
+        if "x-profile" not in headers or not admin_token_valid(headers.get("x-admin-token", "")):
+            await self.app(scope, receive, send)
+            return
+        if not profile_lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+        status = []
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+
+        try:
+            sampler = Sampler().start()
+            try:
+                await self.app(scope, receive, capture)
+            finally:
+                sampler.stop()
+        finally:
+            profile_lock.release()
+        response = PlainTextResponse(
+            sampler.collapsed(),
+            headers={"X-Profiled-Status": str(status[0] if status else 500), "X-Profile-Samples": str(sampler.samples)},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,128 @@
+"""
+Slow-statement log with sampled EXPLAIN plans, served on GET /admin/slow-queries.
+
+Statements taking longer than SLOW_QUERY_MS are kept, with their bound
+parameters, in a ring buffer of the last SLOW_QUERY_BUFFER entries. For a
+SLOW_QUERY_EXPLAIN_SAMPLE fraction of them (SELECTs only), a background thread
+asks the database for the plan on a separate connection, so the request that
+ran the statement never waits for it:
+
+    PostgreSQL: EXPLAIN (FORMAT JSON) <statement>
+    SQLite:     EXPLAIN QUERY PLAN <statement>
+
+A plan that stops using an index shows up as a Seq Scan (or SCAN) in the
+entry's "plan" field.
+"""
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from sqlalchemy import event
+
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_EXPLAIN_SAMPLE = float(os.environ.get("SLOW_QUERY_EXPLAIN_SAMPLE", "0.1"))
+SLOW_QUERY_BUFFER = int(os.environ.get("SLOW_QUERY_BUFFER", "100"))
+# Long statements (bulk inserts) and their parameters are cut to keep the buffer small.
+MAX_STATEMENT_LENGTH = 4000
+MAX_PARAMETERS = 50
+
+class SlowQueryLog:
+    """Ring buffer of slow statements plus the worker that fills in their plans."""
+
+    def __init__(self, size: int = SLOW_QUERY_BUFFER):
+        self.entries = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        self._pending = []
+
+    def record(self, engine, statement: str, parameters, duration: float, explain: bool = True) -> dict:
+        entry = {
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(duration * 1000, 3),
+            "statement": statement[:MAX_STATEMENT_LENGTH],
+            "parameters": _printable(parameters),
+            "plan": None,
+        }
+        with self._lock:
+            self.entries.append(entry)
+        if explain and _explainable(statement) and random.random() < SLOW_QUERY_EXPLAIN_SAMPLE:
+            future = self._explainer.submit(_explain, engine, statement, parameters, entry)
+            with self._lock:
+                self._pending = [pending for pending in self._pending if not pending.done()] + [future]
+        return entry
+
+    def snapshot(self) -> list:
+        """Entries, newest first."""
+        with self._lock:
+            return list(reversed(self.entries))
+
+    def wait(self, timeout: float = 10) -> None:
+        """Blocks until queued EXPLAINs have finished (for tests and benchmarks)."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            future.result(timeout=timeout)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.entries.clear()
+
+slow_query_log = SlowQueryLog()
+
+def _explainable(statement: str) -> bool:
+    # EXPLAIN without ANALYZE wouldn't run writes either, but their plans are rarely the problem.
+    return statement.lstrip()[:6].upper().startswith(("SELECT", "WITH"))
+
+def _printable(parameters):
+    if parameters is None:
+        return None
+    if isinstance(parameters, dict):
+        return {key: _printable_value(value) for key, value in list(parameters.items())[:MAX_PARAMETERS]}
+    if isinstance(parameters, (list, tuple)):
+        return [_printable(value) if isinstance(value, (dict, list, tuple)) else _printable_value(value)
+                for value in list(parameters)[:MAX_PARAMETERS]]
+    return _printable_value(parameters)
+
+def _printable_value(value):
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    text = str(value)
+    return text if len(text) <= 200 else text[:200] + "..."
+
+def _explain(engine, statement: str, parameters, entry: dict) -> None:
+    try:
+        with engine.connect() as conn:
+            if engine.dialect.name == "postgresql":
+                row = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+                entry["plan"] = row
+            else:
+                rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).mappings().all()
+                entry["plan"] = [dict(row) for row in rows]
+    except Exception as e:
+        entry["plan"] = {"error": str(e)}
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["slow_query_start"].pop()
+    if duration * 1000 >= SLOW_QUERY_MS and not statement.lstrip().upper().startswith("EXPLAIN"):
+        # An executemany batch has no single parameter set to explain with.
+        slow_query_log.record(conn.engine, statement, parameters, duration, explain=not executemany)
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    starts = connection.info.get("slow_query_start") if connection is not None else None
+    if starts:
+        starts.pop()
+
+def instrument_engine_slow_queries(engine) -> None:
+    """Records the engine's statements slower than SLOW_QUERY_MS. Safe to call twice."""
+    if event.contains(engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
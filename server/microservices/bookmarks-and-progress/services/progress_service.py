@@ -0,0 +1,165 @@
+# services/progress_service.py
+"""
+Maintains the bookmark status counters: per user in `user_progress` and per
+issue in `issue_progress`.
+
+The bookmark mutations call `apply_status_deltas` inside their own transaction,
+so the counters commit (or roll back) together with the bookmark rows.
+`reconcile_progress` rebuilds both from `user_issues` with one GROUP BY each,
+and `push_issue_stats` ships changed per-issue counters to the issue-aggregator
+in batches. Both can be run as jobs:
+
+    python -m services.progress_service reconcile
+    python -m services.progress_service push-stats [--interval SECONDS]
+"""
+import argparse
+import datetime
+import time
+from collections import Counter
+from typing import Iterable, Optional
+from sqlalchemy import func, update, bindparam
+from sqlalchemy.orm import Session
+from models.database import dialect_insert
+from models.models import UserIssue, UserProgress, IssueProgress, ProgressStatus
+from integrations.issue_aggregator import push_issue_stats as send_issue_stats
+
+STATUS_COLUMNS = [status.value for status in ProgressStatus]
+RECONCILE_BATCH_SIZE = 1000
+PUSH_BATCH_SIZE = 500
+
+def _upsert_counters(db: Session, model, key: str, rows: dict, increment: bool, extra: Optional[dict] = None) -> None:
+    """
+    Writes {key_value: {status: count}} into `model` with INSERT ... ON CONFLICT.
+    When `increment` is set the counts are added to the stored ones, otherwise
+    they replace them.
+    """
+    now = datetime.datetime.utcnow()
+    values = [{key: key_value, "updated_at": now, **(extra or {}), **counts} for key_value, counts in rows.items()]
+    for start in range(0, len(values), RECONCILE_BATCH_SIZE):
+        stmt = dialect_insert(db)(model).values(values[start:start + RECONCILE_BATCH_SIZE])
+        set_ = {
+            column: getattr(model, column) + getattr(stmt.excluded, column) if increment else getattr(stmt.excluded, column)
+            for column in STATUS_COLUMNS
+        }
+        set_["updated_at"] = stmt.excluded.updated_at
+        for column in (extra or {}):
+            set_[column] = getattr(stmt.excluded, column)
+        db.execute(stmt.on_conflict_do_update(index_elements=[key], set_=set_))
+
+def apply_status_deltas(db: Session, deltas: Counter) -> None:
+    """
+    Adds `deltas` ({(user_id, issue_id, ProgressStatus): n}) to the user and issue
+    counters, one upsert statement per table. Does not commit.
+    """
+    by_user, by_issue = {}, {}
+    for (user_id, issue_id, status), n in deltas.items():
+        if n:
+            by_user.setdefault(user_id, dict.fromkeys(STATUS_COLUMNS, 0))[status.value] += n
+            by_issue.setdefault(issue_id, dict.fromkeys(STATUS_COLUMNS, 0))[status.value] += n
+    if by_user:
+        _upsert_counters(db, UserProgress, "user_id", by_user, increment=True)
+    if by_issue:
+        # Marked dirty so the next push_issue_stats run ships them.
+        _upsert_counters(db, IssueProgress, "issue_id", by_issue, increment=True, extra={"dirty": True})
+
+def _recount(db: Session, model, key: str, column, ids: Optional[list]) -> dict:
+    query = db.query(column, UserIssue.status, func.count()).group_by(column, UserIssue.status)
+    existing = db.query(getattr(model, key))
+    if ids is not None:
+        query = query.filter(column.in_(ids))
+        existing = existing.filter(getattr(model, key).in_(ids))
+    rows = {key_value: dict.fromkeys(STATUS_COLUMNS, 0) for (key_value,) in existing}
+    for key_value, status, count in query:
+        rows.setdefault(key_value, dict.fromkeys(STATUS_COLUMNS, 0))[status.value] = count
+    return rows
+
+def reconcile_progress(db: Session, user_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recomputes the per-user counters from `user_issues` with one GROUP BY and
+    overwrites them. Restricted to `user_ids` when given. Returns the number of
+    users written. Does not commit.
+    """
+    rows = _recount(db, UserProgress, "user_id", UserIssue.user_id, list(user_ids) if user_ids is not None else None)
+    if rows:
+        _upsert_counters(db, UserProgress, "user_id", rows, increment=False)
+    return len(rows)
+
+def reconcile_issue_progress(db: Session, issue_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Same as reconcile_progress for the per-issue counters. Rewritten rows are
+    marked dirty so corrections reach the issue-aggregator. Does not commit.
+    """
+    rows = _recount(db, IssueProgress, "issue_id", UserIssue.issue_id, list(issue_ids) if issue_ids is not None else None)
+    if rows:
+        _upsert_counters(db, IssueProgress, "issue_id", rows, increment=False, extra={"dirty": True})
+    return len(rows)
+
+def get_progress(db: Session, user_id: int) -> dict:
+    """Returns the counters for one user (all zero if the user has no bookmarks)."""
+    row = db.query(UserProgress).filter(UserProgress.user_id == user_id).first()
+    return {column: getattr(row, column) if row else 0 for column in STATUS_COLUMNS}
+
+def push_issue_stats(db: Session, batch_size: int = PUSH_BATCH_SIZE) -> int:
+    """
+    Sends dirty per-issue counters to the issue-aggregator, one request per batch,
+    and clears the dirty flag of every row that didn't change in the meantime.
+    Commits after each batch. Returns the number of issues pushed.
+    """
+    pushed = 0
+    while True:
+        # No row locks are held across the HTTP call, so mutations never wait on a
+        # push; the updated_at check below catches rows that changed meanwhile.
+        batch = (
+            db.query(IssueProgress)
+            .filter(IssueProgress.dirty.is_(True))
+            .order_by(IssueProgress.issue_id)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            return pushed
+        send_issue_stats([
+            {"issueId": row.issue_id, **{_camel(column): getattr(row, column) for column in STATUS_COLUMNS}}
+            for row in batch
+        ])
+        # Only rows whose counters haven't moved since we read them are clean now.
+        db.connection().execute(
+            update(IssueProgress)
+            .where(IssueProgress.issue_id == bindparam("b_issue_id"))
+            .where(IssueProgress.updated_at == bindparam("b_updated_at"))
+            .values(dirty=False),
+            [{"b_issue_id": row.issue_id, "b_updated_at": row.updated_at} for row in batch],
+        )
+        db.commit()
+        pushed += len(batch)
+        if len(batch) < batch_size:
+            return pushed
+
+def _camel(name: str) -> str:
+    head, *rest = name.split("_")
+    return head + "".join(part.title() for part in rest)
+
+
+if __name__ == "__main__":
+    from models.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Bookmark progress counter jobs")
+    parser.add_argument("job", choices=["reconcile", "push-stats"])
+    parser.add_argument("--interval", type=float, default=None, help="push-stats: keep running, pushing every N seconds")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.job == "reconcile":
+            users = reconcile_progress(db)
+            issues = reconcile_issue_progress(db)
+            db.commit()
+            print(f"Reconciled progress counters for {users} users and {issues} issues")
+        else:
+            while True:
+                print(f"Pushed stats for {push_issue_stats(db)} issues")
+                if args.interval is None:
+                    break
+                time.sleep(args.interval)
+    finally:
+        db.close()
@@ -3,6 +3,7 @@ import os
 import pytest
 import json
 import asyncio
+from fastapi import Request
 from fastapi.testclient import TestClient
 
 from main import app
@@ -17,15 +18,17 @@ client = TestClient(app)
 # Override the GraphQL context getter for testing
 # This override ensures that every request gets a dummy userId (e.g., 1)
 # and a fresh database session.
-async def test_get_context(request):
+async def override_get_context(request: Request):
     # Force a dummy userId for testing purposes.
-    request.state.userId = 1
+    request.state.user_id = 1
     db = SessionLocal()
-    return {"request": request, "db": db, "userId": 1}
+    return {"request": request, "db": db, "user_id": 1, "issue_loader": create_issue_loader()}
 
-# Patch the graphql_app's context_getter to use our test version.
-from graphql_server import graphql_app
-graphql_app.context_getter = test_get_context
+# The GraphQLRouter resolves its context through FastAPI's dependency system,
+# so overriding get_context there swaps it for every request.
+from graphql_server import get_context
+from graphql_server.loaders import create_issue_loader
+app.dependency_overrides[get_context] = override_get_context
 
 def test_create_bookmark():
     mutation = """
@@ -155,3 +158,363 @@ def test_delete_bookmark():
     for b in bookmarks:
         assert b["id"] != bookmark_id
 
+
+
+def test_get_bookmarks_keyset_pagination():
+    for issue_id in range(300, 305):
+        status = "in_progress" if issue_id % 2 else "to_do"
+        mutation = f"""
+        mutation {{
+          createBookmark(input: {{ userId: 1, issueId: {issue_id}, status: {status} }}) {{
+            id
+          }}
+        }}
+        """
+        response = client.post("/graphql", json={"query": mutation})
+        assert "errors" not in response.json(), response.json()
+
+    query = """
+    query Page($after: String) {
+      getBookmarks(first: 2, after: $after, orderBy: updated_at_asc) {
+        id
+        updatedAt
+        cursor
+      }
+    }
+    """
+    seen = []
+    after = None
+    while True:
+        response = client.post("/graphql", json={"query": query, "variables": {"after": after}})
+        data = response.json()
+        assert "errors" not in data, data.get("errors")
+        page = data["data"]["getBookmarks"]
+        if not page:
+            break
+        assert len(page) <= 2
+        seen.extend(page)
+        after = page[-1]["cursor"]
+
+    ids = [b["id"] for b in seen]
+    assert len(ids) == len(set(ids))
+    assert [(b["updatedAt"], b["id"]) for b in seen] == sorted((b["updatedAt"], b["id"]) for b in seen)
+
+    query_all = "query { getBookmarks { id } }"
+    all_bookmarks = client.post("/graphql", json={"query": query_all}).json()["data"]["getBookmarks"]
+    assert sorted(ids) == sorted(b["id"] for b in all_bookmarks)
+
+def test_get_bookmarks_filtered_by_status():
+    query = """
+    query {
+      getBookmarks(status: in_progress, first: 50) {
+        status
+      }
+    }
+    """
+    response = client.post("/graphql", json={"query": query})
+    data = response.json()
+    assert "errors" not in data, data.get("errors")
+    bookmarks = data["data"]["getBookmarks"]
+    assert len(bookmarks) >= 1
+    assert all(b["status"] == "in_progress" for b in bookmarks)
+
+def test_get_bookmarks_invalid_cursor():
+    query = """
+    query {
+      getBookmarks(first: 2, after: "not-a-cursor") {
+        id
+      }
+    }
+    """
+    response = client.post("/graphql", json={"query": query})
+    assert "errors" in response.json()
+
+def test_create_bookmarks_batch():
+    mutation = """
+    mutation Create($input: [CreateBookmarkInput!]!) {
+      createBookmarks(input: $input) {
+        ok
+        error
+        bookmark { id issueId status }
+      }
+    }
+    """
+    variables = {"input": [
+        {"userId": 1, "issueId": 400, "status": "to_do"},
+        {"userId": 1, "issueId": 401, "status": "in_progress"},
+        {"userId": 1, "issueId": 400, "status": "to_do"},
+        {"userId": 1, "issueId": 42, "status": "to_do"},
+    ]}
+    response = client.post("/graphql", json={"query": mutation, "variables": variables})
+    data = response.json()
+    assert "errors" not in data, data.get("errors")
+    results = data["data"]["createBookmarks"]
+    assert [r["ok"] for r in results] == [True, True, False, False]
+    assert results[0]["bookmark"]["issueId"] == 400
+    assert results[1]["bookmark"]["status"] == "in_progress"
+    assert results[2]["error"] == "Bookmark already exists"
+    assert results[3]["error"] == "Bookmark already exists"
+
+def test_update_and_delete_bookmarks_batch():
+    mutation_create = """
+    mutation {
+      createBookmarks(input: [
+        { userId: 1, issueId: 500, status: to_do },
+        { userId: 1, issueId: 501, status: to_do }
+      ]) {
+        bookmark { id }
+      }
+    }
+    """
+    created = client.post("/graphql", json={"query": mutation_create}).json()["data"]["createBookmarks"]
+    ids = [r["bookmark"]["id"] for r in created]
+
+    mutation_update = """
+    mutation Update($input: [UpdateBookmarkInput!]!) {
+      updateBookmarks(input: $input) {
+        ok
+        error
+        bookmark { id status prLink }
+      }
+    }
+    """
+    variables = {"input": [
+        {"id": ids[0], "status": "completed"},
+        {"id": ids[1], "status": "completed", "prLink": "http://example.com/pr/501"},
+        {"id": 999999, "status": "completed"},
+    ]}
+    response = client.post("/graphql", json={"query": mutation_update, "variables": variables})
+    data = response.json()
+    assert "errors" not in data, data.get("errors")
+    results = data["data"]["updateBookmarks"]
+    assert [r["ok"] for r in results] == [True, True, False]
+    assert all(r["bookmark"]["status"] == "completed" for r in results[:2])
+    assert results[1]["bookmark"]["prLink"] == "http://example.com/pr/501"
+    assert results[2]["error"] == "Bookmark not found"
+
+    mutation_delete = f"""
+    mutation {{
+      deleteBookmarks(ids: [{ids[0]}, {ids[1]}, 999999]) {{
+        ok
+        bookmark {{ id }}
+      }}
+    }}
+    """
+    response = client.post("/graphql", json={"query": mutation_delete})
+    data = response.json()
+    assert "errors" not in data, data.get("errors")
+    assert [r["ok"] for r in data["data"]["deleteBookmarks"]] == [True, True, False]
+
+    remaining = client.post("/graphql", json={"query": "query { getBookmarks { id } }"}).json()
+    assert not {b["id"] for b in remaining["data"]["getBookmarks"]} & set(ids)
+
+def bookmark_counts_by_status():
+    bookmarks = client.post("/graphql", json={"query": "query { getBookmarks { status } }"}).json()["data"]["getBookmarks"]
+    counts = {"toDo": 0, "inProgress": 0, "completed": 0, "dropped": 0}
+    key = {"to_do": "toDo", "in_progress": "inProgress", "completed": "completed", "dropped": "dropped"}
+    for b in bookmarks:
+        counts[key[b["status"]]] += 1
+    return counts
+
+PROGRESS_QUERY = """
+query {
+  progressSummary(userId: 1) {
+    toDo
+    inProgress
+    completed
+    dropped
+    total
+  }
+}
+"""
+
+def test_progress_summary_tracks_mutations():
+    mutation = """
+    mutation {
+      createBookmarks(input: [
+        { userId: 1, issueId: 600, status: to_do },
+        { userId: 1, issueId: 601, status: dropped }
+      ]) {
+        bookmark { id }
+      }
+    }
+    """
+    created = client.post("/graphql", json={"query": mutation}).json()["data"]["createBookmarks"]
+    client.post("/graphql", json={"query": f"""
+    mutation {{
+      updateBookmark(input: {{ id: {created[0]["bookmark"]["id"]}, status: completed }}) {{ id }}
+    }}
+    """})
+    client.post("/graphql", json={"query": f"""
+    mutation {{
+      deleteBookmark(id: {created[1]["bookmark"]["id"]}) {{ id }}
+    }}
+    """})
+
+    data = client.post("/graphql", json={"query": PROGRESS_QUERY}).json()
+    assert "errors" not in data, data.get("errors")
+    summary = data["data"]["progressSummary"]
+    expected = bookmark_counts_by_status()
+    assert {k: summary[k] for k in expected} == expected
+    assert summary["total"] == sum(expected.values())
+
+def test_reconcile_progress_repairs_counters():
+    from models.models import UserProgress
+    from services.progress_service import reconcile_progress
+
+    db = SessionLocal()
+    try:
+        db.query(UserProgress).filter(UserProgress.user_id == 1).update({"to_do": 999, "completed": 0})
+        db.commit()
+        assert reconcile_progress(db, user_ids=[1]) == 1
+        db.commit()
+    finally:
+        db.close()
+
+    summary = client.post("/graphql", json={"query": PROGRESS_QUERY}).json()["data"]["progressSummary"]
+    expected = bookmark_counts_by_status()
+    assert {k: summary[k] for k in expected} == expected
+
+def test_issue_progress_pushed_in_batches(monkeypatch):
+    from models.models import UserIssue, IssueProgress
+    from services import progress_service
+
+    client.post("/graphql", json={"query": """
+    mutation {
+      createBookmarks(input: [
+        { userId: 1, issueId: 700, status: in_progress },
+        { userId: 2, issueId: 700, status: in_progress },
+        { userId: 3, issueId: 700, status: to_do }
+      ]) { ok }
+    }
+    """})
+
+    sent = []
+    monkeypatch.setattr(progress_service, "send_issue_stats", lambda stats: sent.append(stats) or len(stats))
+    db = SessionLocal()
+    try:
+        pushed = progress_service.push_issue_stats(db, batch_size=2)
+        # Issues whose last bookmark was deleted are still pushed, with zero counts.
+        expected = {row.issue_id for row in db.query(IssueProgress.issue_id)}
+        assert {row.issue_id for row in db.query(UserIssue.issue_id)} <= expected
+        assert pushed == len(expected)
+        assert all(len(batch) <= 2 for batch in sent)
+        stats = {s["issueId"]: s for batch in sent for s in batch}
+        assert set(stats) == expected
+        assert stats[700] == {"issueId": 700, "toDo": 1, "inProgress": 2, "completed": 0, "dropped": 0}
+        # Everything was delivered, so the next run has nothing to send.
+        assert db.query(IssueProgress).filter(IssueProgress.dirty.is_(True)).count() == 0
+        assert progress_service.push_issue_stats(db) == 0
+    finally:
+        db.close()
+
+class FakeAggregatorResponse:
+    status_code = 200
+    headers = {}
+
+    def __init__(self, ids):
+        self.ids = ids
+        self.text = ""
+
+    def json(self):
+        return {"data": {"issuesByIds": [
+            {
+                "id": id,
+                "title": f"Issue {id}",
+                "description": None,
+                "state": "OPEN",
+                "url": f"https://github.com/example/repo/issues/{id}",
+                "source": "GITHUB",
+                "labels": ["good first issue"],
+                "repositoryId": 1,
+                "createdAt": "2025-03-01T12:00:00",
+                "updatedAt": "2025-03-02T12:00:00",
+            } if id != 42 else None
+            for id in self.ids
+        ]}}
+
+def test_bookmark_issue_hydrated_in_one_batch(monkeypatch):
+    from integrations import issue_aggregator
+
+    calls = []
+    def fake_post(url, json, timeout, **kwargs):
+        calls.append(json["variables"]["ids"])
+        return FakeAggregatorResponse(json["variables"]["ids"])
+
+    issue_aggregator.issue_cache.clear()
+    monkeypatch.setattr(issue_aggregator.requests, "post", fake_post)
+
+    query = """
+    query {
+      getBookmarks(first: 50) {
+        issueId
+        issue { id title labels }
+      }
+    }
+    """
+    data = client.post("/graphql", json={"query": query}).json()
+    assert "errors" not in data, data.get("errors")
+    bookmarks = data["data"]["getBookmarks"]
+    assert len(bookmarks) > 1
+    assert len(calls) == 1
+    assert sorted(calls[0]) == sorted({b["issueId"] for b in bookmarks})
+    for b in bookmarks:
+        if b["issueId"] == 42:
+            assert b["issue"] is None
+        else:
+            assert b["issue"]["id"] == b["issueId"]
+            assert b["issue"]["title"] == f"Issue {b['issueId']}"
+
+    # A second page load is served from the TTL cache.
+    client.post("/graphql", json={"query": query})
+    assert len(calls) == 1
+
+def test_metrics_endpoint():
+    body = client.get("/metrics").text
+    assert 'graphql_resolver_duration_seconds_count{field="Query.getBookmarks"}' in body
+    assert 'graphql_resolver_duration_seconds_count{field="Bookmark.issue"}' in body
+    assert 'db_statements_total{statement="SELECT"}' in body
+    # Recorded by the hydration test above.
+    assert 'upstream_responses_total{endpoint="issuesByIds",service="issue-aggregator",status="200"}' in body
+
+def test_server_timing_header():
+    response = client.post("/graphql", json={"query": "{ getBookmarks(first: 5) { id } }"})
+    header = response.headers["Server-Timing"]
+    assert [part.strip().split(";")[0] for part in header.split(",")] == ["parse", "validate", "resolve", "db", "serialize"]
+    assert 'desc="0 queries"' not in header
+
+# --- Query plans (PostgreSQL only) ---
+
+# The cost limits below are calibrated for this many synthetic users (~25 bookmarks each).
+PLAN_TEST_USERS = 5000
+
+@pytest.fixture(scope="module")
+def seeded_postgres():
+    """Replaces the bookmarks with a synthetic dataset (server/tools/synthetic_data.py)."""
+    import subprocess
+    import sys
+    if engine.dialect.name != "postgresql":
+        pytest.skip("query-plan tests need BOOKMARKS_DB_URL on PostgreSQL")
+    path = os.path.join(os.path.dirname(__file__), "..", "..", "..", "tools", "synthetic_data.py")
+    if not os.path.exists(path):
+        pytest.skip("server/tools is not part of this checkout")
+    subprocess.run(
+        [sys.executable, path, f"--users={PLAN_TEST_USERS}", "--issues=50000", "--truncate",
+         "--bookmarks-db", engine.url.render_as_string(hide_password=False)],
+        check=True, capture_output=True,
+    )
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("VACUUM ANALYZE")
+
+@pytest.mark.parametrize("query, index, max_cost", [
+    ("{ getBookmarks(first: 20) { id } }", "ix_user_issue_updated", 100),
+    ("{ getBookmarks(status: in_progress, first: 20) { id } }", "ix_user_issue_status_updated", 100),
+], ids=["getBookmarks", "getBookmarksByStatus"])
+def test_get_bookmarks_plans(seeded_postgres, query, index, max_cost):
+    """Test that a page of bookmarks is planned as a range scan on the keyset index, whatever the user's total."""
+    from observability.query_plans import assert_plan, capture_statements
+    with capture_statements(engine) as statements:
+        data = client.post("/graphql", json={"query": query}).json()
+    assert "errors" not in data, data.get("errors")
+    statement, parameters = statements[0]
+    assert_plan(engine, statement, parameters, index=index, max_cost=max_cost)
@@ -0,0 +1,79 @@
+"""
+Measures ingestion throughput and resilience against the local GitHub stub.
+
+Runs the refreshIssues, refreshLabels and refreshRepositories mutations
+through the schema against a temporary SQLite database, with every GitHub call
+going to server/tools/github_stub.py. Prints latency percentiles per mutation,
+rows stored per second and how many runs failed, so the effect of upstream
+latency, 502s and rate limiting on ingestion can be compared offline:
+
+    python server/tools/github_stub.py --latency-ms 80 --error-rate 0.05 &
+    GITHUB_API_URL=http://localhost:9000 python -m benchmarks.ingestion [--runs 50]
+
+To reproduce a production run instead, record it once with
+HTTP_CASSETTE_MODE=record and replay it here (see integrations.cassettes):
+
+    HTTP_CASSETTE_MODE=replay HTTP_CASSETTE_DIR=prod-cassettes python -m benchmarks.ingestion
+"""
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+# Settle the environment before models.database and the integrations read it.
+os.environ.setdefault("TESTING", "1")
+_db_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False).name
+os.environ.setdefault("ISSUE_DB_URL", f"sqlite:///{_db_file}")
+os.environ.setdefault("GITHUB_API_URL", "http://localhost:9000")
+
+from sqlalchemy.orm import Session
+from graphql_server import schema
+from models.database import engine
+from models.models import Base, Issues, Labels, Repositories
+
+MUTATIONS = {
+    "refreshIssues": ("mutation { refreshIssues }", Issues),
+    "refreshLabels": ('mutation { refreshLabels(repositoryOwner: "apache", repositoryName: "airflow") }', Labels),
+    "refreshRepositories": ('mutation { refreshRepositories(label: "hacktoberfest") { id } }', Repositories),
+}
+
+def run(db: Session, mutation: str, model):
+    start = time.perf_counter()
+    result = schema.execute_sync(mutation, context_value={"db": db})
+    elapsed = time.perf_counter() - start
+    # The refresh mutations report failures in their return value rather than as errors.
+    value = next(iter(result.data.values())) if result.data else None
+    failed = bool(result.errors) or (isinstance(value, str) and value.startswith("Failed"))
+    return elapsed, failed, db.query(model).count()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+    # Failed runs are counted below; strawberry would log each one's traceback.
+    logging.getLogger("strawberry.execution").setLevel(logging.CRITICAL)
+
+    Base.metadata.create_all(bind=engine)
+    print(f"GitHub at {os.environ['GITHUB_API_URL']}, {args.runs} runs per mutation (times in ms)")
+    print(f"{'mutation':<22}{'p50':>10}{'p95':>10}{'max':>10}{'rows/s':>10}{'failed':>8}")
+    with Session(engine) as db:
+        for name, (mutation, model) in MUTATIONS.items():
+            times, failures, rows = [], 0, 0
+            for _ in range(args.runs):
+                elapsed, failed, count = run(db, mutation, model)
+                times.append(elapsed)
+                failures += failed
+                rows += 0 if failed else count
+            times.sort()
+            print(
+                f"{name:<22}{statistics.median(times) * 1000:>10.1f}{times[int(len(times) * 0.95)] * 1000:>10.1f}"
+                f"{times[-1] * 1000:>10.1f}{rows / sum(times):>10.0f}{failures:>8}"
+            )
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        os.unlink(_db_file)
@@ -0,0 +1,136 @@
+"""
+Measures the cost of the Prometheus instrumentation (observability.metrics).
+
+Runs the same queries through two copies of the schema against a seeded SQLite
+database: one without MetricsExtension and with a plain engine, one with the
+extension and an instrumented engine. Prints the mean and p50 per query and the
+p50 difference between the two, then the fixed cost of each hook measured in
+isolation. Large list queries pay mostly for the per-field resolve wrapper,
+which strawberry installs on every field once an extension implements resolve.
+
+    python -m benchmarks.metrics_overhead [--issues 2000] [--repeat 300]
+"""
+import argparse
+import gc
+import os
+import statistics
+import tempfile
+import time
+
+# Settle the environment before models.database reads it.
+os.environ.setdefault("TESTING", "1")
+_db_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False).name
+os.environ.setdefault("ISSUE_DB_URL", f"sqlite:///{_db_file}")
+
+import strawberry
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from graphql_server import Query, Mutation
+from models.models import Base, Issues
+from observability import metrics
+from observability.metrics import MetricsExtension, instrument_engine
+
+QUERIES = {
+    "issues": "{ issues { id title labels state } }",
+    "issue": "{ issue(id: 1) { id title } }",
+    "issuesBySource": "{ issuesBySource(source: GITHUB) { id title } }",
+}
+
+def seed(engine, count: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        db.add_all([
+            Issues(
+                title=f"Issue {n}",
+                description="Benchmark issue",
+                state=n % 2 == 0,
+                source="github" if n % 3 else "gitlab",
+                labels=["good first issue"] if n % 5 == 0 else ["bug"],
+                repository_id=n % 50,
+            )
+            for n in range(count)
+        ])
+        db.commit()
+
+def run(schema, db: Session, query: str) -> float:
+    # Keep the collector out of the timed region and start each run from a clean session.
+    db.expunge_all()
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        result = schema.execute_sync(query, context_value={"db": db})
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.enable()
+    assert result.errors is None, result.errors
+    return elapsed
+
+def compare(plain, plain_db, instrumented, instrumented_db, query: str, repeat: int):
+    """Alternates the two schemas run by run so drift (GC, CPU frequency) hits both equally."""
+    base, measured = [], []
+    for _ in range(5):
+        run(plain, plain_db, query)
+        run(instrumented, instrumented_db, query)
+    for n in range(repeat):
+        # Swap the order every run so neither side always pays for the other's garbage.
+        if n % 2:
+            measured.append(run(instrumented, instrumented_db, query))
+            base.append(run(plain, plain_db, query))
+        else:
+            base.append(run(plain, plain_db, query))
+            measured.append(run(instrumented, instrumented_db, query))
+    return base, measured
+
+def hook_costs(calls: int = 100000) -> dict:
+    """Microseconds per SQL statement hook pair and per timed resolver observation."""
+    class FakeConnection:
+        info = {}
+
+    conn = FakeConnection()
+    start = time.perf_counter()
+    for _ in range(calls):
+        metrics._before_cursor_execute(conn, None, "SELECT 1", None, None, False)
+        metrics._after_cursor_execute(conn, None, "SELECT 1", None, None, False)
+    sql = (time.perf_counter() - start) / calls * 1e6
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        metrics.GRAPHQL_RESOLVER_SECONDS.labels("Query.issues").observe(time.perf_counter() - start)
+    resolver = (time.perf_counter() - start) / calls * 1e6
+    return {"sql_statement_us": sql, "resolver_us": resolver}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--issues", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=300)
+    args = parser.parse_args()
+
+    url = os.environ["ISSUE_DB_URL"]
+    plain_engine = create_engine(url)
+    instrumented_engine = create_engine(url)
+    instrument_engine(instrumented_engine)
+    seed(plain_engine, args.issues)
+
+    plain = strawberry.Schema(query=Query, mutation=Mutation)
+    instrumented = strawberry.Schema(query=Query, mutation=Mutation, extensions=[MetricsExtension])
+
+    print(f"{args.issues} issues, {args.repeat} runs per query (times in ms)")
+    print(f"{'query':<16}{'plain mean':>12}{'plain p50':>12}{'metrics mean':>14}{'metrics p50':>13}{'overhead':>10}")
+    with Session(plain_engine) as plain_db, Session(instrumented_engine) as instrumented_db:
+        for name, query in QUERIES.items():
+            base, measured = compare(plain, plain_db, instrumented, instrumented_db, query, args.repeat)
+            base_p50, measured_p50 = statistics.median(base) * 1000, statistics.median(measured) * 1000
+            print(
+                f"{name:<16}{statistics.mean(base) * 1000:>12.3f}{base_p50:>12.3f}"
+                f"{statistics.mean(measured) * 1000:>14.3f}{measured_p50:>13.3f}"
+                f"{(measured_p50 - base_p50) / base_p50:>10.1%}"
+            )
+    costs = hook_costs()
+    print(f"per SQL statement: {costs['sql_statement_us']:.2f} us, per timed resolver: {costs['resolver_us']:.2f} us")
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        os.unlink(_db_file)
@@ -0,0 +1,277 @@
+"""
+Times every Query field end to end through the schema at several data scales.
+
+For each scale the tables are dropped, recreated and seeded with a
+deterministic synthetic dataset (issues, labels, repositories, projects, user
+issues, issue-label associations and issue stats), then each query runs
+through `graphql_server.schema` with a fresh session until --repeat runs or
+--max-seconds have been spent (at least three runs). Results are written as
+JSON keyed by scale and query, so two runs can be compared:
+
+    python -m benchmarks.resolvers --scales 10000,100000 --output before.json
+    python -m benchmarks.resolvers --scales 10000,100000 --output after.json
+    python -m benchmarks.resolvers --compare before.json after.json
+
+SQLite (a temporary file) is used unless BENCH_DB_URL points at PostgreSQL,
+whose tables in that database are dropped. issuesByLabel needs PostgreSQL's
+JSONB and is skipped on SQLite. Nothing touches the network. Scales of
+1000000 issues take several minutes to seed and run.
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+
+# Settle the environment before models.database reads it.
+_db_file = None
+BENCH_DB_URL = os.environ.get("BENCH_DB_URL")
+if BENCH_DB_URL is None:
+    _db_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False).name
+    BENCH_DB_URL = f"sqlite:///{_db_file}"
+os.environ["TESTING"] = "0" if BENCH_DB_URL.startswith("postgresql") else "1"
+os.environ.setdefault("ISSUE_DB_URL", BENCH_DB_URL)
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from graphql_server import schema
+from models.models import Base, Issues, Labels, Repositories, Projects, UserIssues, IssueLabel, IssueStats
+
+LABEL_NAMES = [
+    "good first issue", "help wanted", "bug", "enhancement", "documentation",
+    "beginner", "easy", "hacktoberfest", "question", "tests",
+]
+LANGUAGES = ["Python", "JavaScript", "TypeScript", "Go", "Rust", "Java", "C++", "Ruby"]
+STATUSES = ["backlog", "in_progress", "completed", "archived", "dropped"]
+CHUNK = 10000
+
+def dataset_sizes(issues: int) -> dict:
+    return {
+        "issues": issues,
+        "repositories": max(1, issues // 100),
+        "labels": max(1, issues // 20),
+        "projects": max(1, issues // 100),
+        "user_issues": max(1, issues // 10),
+        "issue_stats": max(1, issues // 3),
+    }
+
+def _insert(conn, table, rows) -> None:
+    """executemany in chunks so memory stays flat at 1M rows."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == CHUNK:
+            conn.execute(insert(table), batch)
+            batch = []
+    if batch:
+        conn.execute(insert(table), batch)
+
+def seed(engine, issues: int, seed_value: int = 42) -> dict:
+    """Recreates the tables and loads a dataset with `issues` issues; returns the row counts."""
+    rng = random.Random(seed_value)
+    sizes = dataset_sizes(issues)
+    now = datetime.datetime(2025, 1, 1)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        _insert(conn, Repositories.__table__, (
+            {
+                "id": n, "external_id": str(100000 + n), "name": f"repo-{n}", "full_name": f"owner-{n % 97}/repo-{n}",
+                "description": "Synthetic repository", "url": f"https://github.com/owner-{n % 97}/repo-{n}",
+                "source": "github" if n % 5 else "gitlab", "language": LANGUAGES[n % len(LANGUAGES)],
+            }
+            for n in range(1, sizes["repositories"] + 1)
+        ))
+        _insert(conn, Labels.__table__, (
+            {
+                "id": n, "name": LABEL_NAMES[n % len(LABEL_NAMES)], "color": "7057ff",
+                "description": "Synthetic label", "repository_id": 1 + n % sizes["repositories"],
+            }
+            for n in range(1, sizes["labels"] + 1)
+        ))
+        # Labels and repositories are skewed: a few popular ones cover most issues.
+        _insert(conn, Issues.__table__, (
+            {
+                "id": n, "external_id": 1000000 + n, "title": f"Issue {n}", "description": "Synthetic issue",
+                "state": rng.random() < 0.7, "created_at": now, "updated_at": now,
+                "url": f"https://github.com/example/repo/issues/{n}",
+                "source": "github" if rng.random() < 0.8 else "gitlab",
+                "labels": sorted({LABEL_NAMES[min(int(rng.paretovariate(1.2)) - 1, len(LABEL_NAMES) - 1)]
+                                  for _ in range(rng.randint(1, 3))}),
+                "repository_id": min(int(rng.paretovariate(0.8)), sizes["repositories"]),
+            }
+            for n in range(1, issues + 1)
+        ))
+        _insert(conn, IssueLabel.__table__, (
+            {"id": n, "issue_id": n, "label_id": 1 + int(rng.paretovariate(1.0)) % sizes["labels"]}
+            for n in range(1, issues + 1)
+        ))
+        _insert(conn, Projects.__table__, (
+            {
+                "id": n, "name": f"Project {n}", "description": "Synthetic project",
+                "url": f"https://github.com/example/project-{n}", "source": "github",
+                "repository_id": 1 + n % sizes["repositories"], "owner_id": 1 + n % max(1, issues // 1000),
+                "created_at": now, "updated_at": now,
+            }
+            for n in range(1, sizes["projects"] + 1)
+        ))
+        _insert(conn, UserIssues.__table__, (
+            {
+                "id": n, "issue": rng.randint(1, issues), "project_id": 1 + n % sizes["projects"],
+                "status": STATUSES[n % len(STATUSES)], "pr_link": f"https://github.com/example/repo/pull/{n}",
+                "created_at": now, "updated_at": now,
+            }
+            for n in range(1, sizes["user_issues"] + 1)
+        ))
+        _insert(conn, IssueStats.__table__, _issue_stats(rng, issues, sizes["issue_stats"], now))
+    return sizes
+
+def _issue_stats(rng: random.Random, issues: int, count: int, now: datetime.datetime):
+    for n in range(1, issues + 1, max(1, issues // count)):
+        to_do, in_progress = int(rng.paretovariate(1.5)), rng.randint(0, 4)
+        yield {
+            "issue_id": n, "to_do": to_do, "in_progress": in_progress, "completed": rng.randint(0, 3),
+            "dropped": rng.randint(0, 2), "tracking": to_do + in_progress, "updated_at": now,
+        }
+
+def queries(sizes: dict) -> dict:
+    """One query per Query field, with arguments that hit existing rows."""
+    issue_id, label_id = sizes["issues"] // 2, sizes["labels"] // 2
+    ids = list(range(1, sizes["issues"] + 1, max(1, sizes["issues"] // 50)))[:50]
+    issue_fields = "id title description state labels source repositoryId trackingCount"
+    return {
+        "issues": f"{{ issues {{ {issue_fields} }} }}",
+        "issue": f"{{ issue(id: {issue_id}) {{ {issue_fields} }} }}",
+        "issuesByIds": f"{{ issuesByIds(ids: {ids}) {{ {issue_fields} }} }}",
+        "issuesByState": f"{{ issuesByState(state: OPEN) {{ {issue_fields} }} }}",
+        "issuesBySource": f"{{ issuesBySource(source: GITLAB) {{ {issue_fields} }} }}",
+        "issuesByLabel": f'{{ issuesByLabel(label: "help wanted") {{ {issue_fields} }} }}',
+        "labels": "{ labels { labelId name color repositoryId } }",
+        "label": f"{{ label(labelId: {label_id}) {{ labelId name }} }}",
+        "labelsByRepository": "{ labelsByRepository(repositoryId: 1) { labelId name } }",
+        "repositories": "{ repositories { id name fullName language source } }",
+        "repository": f"{{ repository(id: {sizes['repositories'] // 2 + 1}) {{ id name }} }}",
+        "repositoriesBySource": "{ repositoriesBySource(source: GITLAB) { id name } }",
+        "projects": "{ projects { projectId name ownerId createdAt } }",
+        "project": f"{{ project(projectId: {sizes['projects'] // 2 + 1}) {{ projectId name }} }}",
+        "projectsByOwner": "{ projectsByOwner(ownerId: 1) { projectId name } }",
+        "userIssues": "{ userIssues { issueId issue status prLink } }",
+        "userIssue": f"{{ userIssue(issueId: {sizes['user_issues'] // 2 + 1}) {{ issueId status }} }}",
+        "userIssuesByProject": "{ userIssuesByProject(projectId: 1) { issueId status } }",
+        "issueLabelAssociations": "{ issueLabelAssociations { id issueId labelId } }",
+        "issueLabelAssociation": f"{{ issueLabelAssociation(id: {issue_id}) {{ id labelId }} }}",
+        "labelsForIssue": f"{{ labelsForIssue(issueId: {issue_id}) {{ id labelId }} }}",
+        "issuesForLabel": f"{{ issuesForLabel(labelId: {label_id}) {{ id issueId }} }}",
+    }
+
+POSTGRES_ONLY = {"issuesByLabel"}
+
+def run(db: Session, query: str) -> float:
+    db.expunge_all()
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        result = schema.execute_sync(query, context_value={"db": db})
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.enable()
+    if result.errors:
+        raise RuntimeError(result.errors[0].message)
+    return elapsed
+
+def measure(db: Session, query: str, repeat: int, max_seconds: float) -> dict:
+    run(db, query)  # Warm caches and strawberry's per-field state.
+    times, spent = [], 0.0
+    while len(times) < repeat and (len(times) < 3 or spent < max_seconds):
+        times.append(run(db, query))
+        spent += times[-1]
+    times.sort()
+    return {
+        "runs": len(times),
+        "mean_ms": round(statistics.mean(times) * 1000, 3),
+        "p50_ms": round(statistics.median(times) * 1000, 3),
+        "p95_ms": round(times[min(len(times) - 1, int(len(times) * 0.95))] * 1000, 3),
+        "min_ms": round(times[0] * 1000, 3),
+    }
+
+def _commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+def benchmark(scales, repeat: int, max_seconds: float, only=None) -> dict:
+    engine = create_engine(BENCH_DB_URL)
+    report = {
+        "meta": {
+            "commit": _commit(),
+            "database": engine.dialect.name,
+            "python": platform.python_version(),
+            "recorded_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "repeat": repeat,
+            "max_seconds": max_seconds,
+        },
+        "results": {},
+    }
+    for scale in scales:
+        start = time.perf_counter()
+        sizes = seed(engine, scale)
+        print(f"seeded {scale} issues in {time.perf_counter() - start:.1f}s")
+        results = report["results"][str(scale)] = {}
+        with Session(engine) as db:
+            for name, query in queries(sizes).items():
+                if only and name not in only:
+                    continue
+                if name in POSTGRES_ONLY and engine.dialect.name != "postgresql":
+                    results[name] = {"skipped": "needs PostgreSQL"}
+                    continue
+                results[name] = measure(db, query, repeat, max_seconds)
+                print(f"  {name:<24}{results[name]['p50_ms']:>12.3f} ms p50 ({results[name]['runs']} runs)")
+    engine.dispose()
+    return report
+
+def compare(before_path: str, after_path: str) -> None:
+    with open(before_path) as before_file, open(after_path) as after_file:
+        before, after = json.load(before_file)["results"], json.load(after_file)["results"]
+    print(f"{'scale':<10}{'query':<26}{'before p50':>12}{'after p50':>12}{'change':>10}")
+    for scale, results in after.items():
+        for name, result in results.items():
+            old = before.get(scale, {}).get(name, {})
+            if "p50_ms" not in result or "p50_ms" not in old:
+                continue
+            change = (result["p50_ms"] - old["p50_ms"]) / old["p50_ms"] if old["p50_ms"] else 0.0
+            print(f"{scale:<10}{name:<26}{old['p50_ms']:>12.3f}{result['p50_ms']:>12.3f}{change:>10.1%}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scales", default="10000,100000", help="comma-separated issue counts")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="time budget per query and scale")
+    parser.add_argument("--only", help="comma-separated Query fields to run")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+    scales = [int(scale) for scale in args.scales.split(",")]
+    only = set(args.only.split(",")) if args.only else None
+    report = benchmark(scales, args.repeat, args.max_seconds, only)
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2, sort_keys=True)
+    print(f"wrote {args.output}")
+
+if __name__ == "__main__":
+    try:
+        main()
+    finally:
+        if _db_file:
+            os.unlink(_db_file)
@@ -1,7 +1,6 @@
-from strawberry.fastapi import GraphQLRouter
 import strawberry
 from strawberry.types import Info
-from typing import List
+from typing import List, Optional
 from .schemas.issue_schema import Issue
 from .schemas.label_schema import Label
 from .schemas.project_schema import Project
@@ -15,6 +14,10 @@ from .resolvers.repo_resolver import RepoQueryResolver, RepoMutationResolver
 from .resolvers.user_issue_resolver import UserIssueQueryResolver, UserIssueMutationResolver
 from .resolvers.issue_label_resolver import IssueLabelQueryResolver, IssueLabelMutationResolver
 from models.database import get_db
+from observability.metrics import MetricsExtension
+from observability.tracing import tracing_extensions
+from observability.server_timing import ServerTimingExtension, TimedGraphQLRouter
+from observability.query_budget import query_budget_extensions
 from fastapi import Depends
 from sqlalchemy.orm import Session
 
@@ -26,6 +29,7 @@ class Query:
     # Issue queries
     issues: List[Issue] = strawberry.field(resolver=QueryResolver.get_issues)
     issue: Issue = strawberry.field(resolver=QueryResolver.get_issue_by_id)
+    issues_by_ids: List[Optional[Issue]] = strawberry.field(resolver=QueryResolver.get_issues_by_ids)
     issues_by_state: List[Issue] = strawberry.field(resolver=QueryResolver.get_issues_by_state)
     issues_by_source: List[Issue] = strawberry.field(resolver=QueryResolver.get_issues_by_source)
     issues_by_label: List[Issue] = strawberry.field(resolver=QueryResolver.get_issues_by_label)
@@ -60,6 +64,7 @@ class Query:
 class Mutation:
     # Issue mutations
     refresh_issues: str = strawberry.mutation(resolver=MutationResolver.refreshIssues)
+    upsertIssueStats: int = strawberry.mutation(resolver=MutationResolver.upsertIssueStats)
 
     # Label mutations
     @strawberry.mutation
@@ -89,5 +94,5 @@ class Mutation:
     deleteIssueLabelAssociation: str = strawberry.mutation(resolver=IssueLabelMutationResolver.deleteIssueLabelAssociation)
 
 # Add the context to the schema
-schema = strawberry.Schema(query=Query, mutation=Mutation)
-graphql_app = GraphQLRouter(schema, context_getter=get_context)
+schema = strawberry.Schema(query=Query, mutation=Mutation, extensions=[MetricsExtension, ServerTimingExtension, *query_budget_extensions(), *tracing_extensions()])
+graphql_app = TimedGraphQLRouter(schema, context_getter=get_context)
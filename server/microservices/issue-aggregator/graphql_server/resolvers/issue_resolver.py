@@ -9,11 +9,14 @@ import datetime
 import strawberry
 from typing import List, Optional, Union
 from strawberry import ID
-from graphql_server.schemas.issue_schema import Issue as GraphQLIssue, State, Source
-from models.models import Issues
+from graphql_server.schemas.issue_schema import Issue as GraphQLIssue, State, Source, IssueSort, IssueStatsInput
+from models.models import Issues, IssueStats
+from decouple import config
 from sqlalchemy.orm import Session
-from sqlalchemy import cast
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import cast, any_, bindparam, Integer
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.dialects.postgresql import JSONB, ARRAY
 from integrations.github_integration import fetch_github_issues
 from integrations.gitlab_integration import fetch_gitlab_issues
 
@@ -48,6 +51,8 @@ def map_issue(orm_issue: Issues) -> GraphQLIssue:
         labels_list = [labels_list]
 
 
+    stats = getattr(orm_issue, "stats", None)
+
     return GraphQLIssue(
         id=orm_issue.id,
         external_id=getattr(orm_issue, "external_id", None),  # adjust if needed
@@ -59,14 +64,35 @@ def map_issue(orm_issue: Issues) -> GraphQLIssue:
         url=getattr(orm_issue, "url", ""),
         source=source_enum,
         labels=labels_list,
-        repository_id=getattr(orm_issue, "repository_id", 0)
+        repository_id=getattr(orm_issue, "repository_id", 0),
+        to_do_count=stats.to_do if stats else 0,
+        in_progress_count=stats.in_progress if stats else 0,
+        completed_count=stats.completed if stats else 0,
+        dropped_count=stats.dropped if stats else 0,
+        tracking_count=stats.tracking if stats else 0,
     )
 
+def apply_issue_sort(query, sort: Optional[IssueSort]):
+    """
+    Orders an Issues query by the popularity counters. Issues nobody has
+    bookmarked have no issue_stats row and count as zero.
+    """
+    if sort is None:
+        return query
+    query = query.outerjoin(IssueStats, IssueStats.issue_id == Issues.id)
+    if sort == IssueSort.LEAST_CROWDED:
+        return query.order_by(IssueStats.tracking.asc().nulls_first(), Issues.id)
+    if sort == IssueSort.MOST_CROWDED:
+        return query.order_by(IssueStats.tracking.desc().nulls_last(), Issues.id)
+    return query.order_by(IssueStats.in_progress.desc().nulls_last(), Issues.id)
+
+MAX_IDS_PER_LOOKUP = 500
+
 class QueryResolver:
     @staticmethod
-    def get_issues(info) -> List[GraphQLIssue]:
+    def get_issues(info, sort: Optional[IssueSort] = None) -> List[GraphQLIssue]:
         db: Session = info.context["db"]
-        orm_issues = db.query(Issues).all()
+        orm_issues = apply_issue_sort(db.query(Issues), sort).all()
         # Map each ORM object to the GraphQL type.
         return [map_issue(issue) for issue in orm_issues]
 
@@ -77,22 +103,44 @@ class QueryResolver:
         return map_issue(orm_issue) if orm_issue else None
 
     @staticmethod
-    def get_issues_by_state(info, state: State) -> List[GraphQLIssue]:
+    def get_issues_by_ids(info, ids: List[int]) -> List[Optional[GraphQLIssue]]:
+        """
+        Batched lookup used to hydrate bookmark pages: one query for all ids.
+        Results follow the order of `ids`, with null for ids that don't exist.
+        """
+        if len(ids) > MAX_IDS_PER_LOOKUP:
+            raise Exception(f"issuesByIds accepts at most {MAX_IDS_PER_LOOKUP} ids")
+        if not ids:
+            return []
+        db: Session = info.context["db"]
+        if db.get_bind().dialect.name == "postgresql":
+            # A single array parameter keeps one statement shape for any batch size.
+            condition = Issues.id == any_(bindparam("ids", list(set(ids)), type_=ARRAY(Integer)))
+        else:
+            condition = Issues.id.in_(set(ids))
+        by_id = {issue.id: issue for issue in db.query(Issues).filter(condition)}
+        return [map_issue(by_id[id]) if id in by_id else None for id in ids]
+
+    @staticmethod
+    def get_issues_by_state(info, state: State, sort: Optional[IssueSort] = None) -> List[GraphQLIssue]:
         db: Session = info.context["db"]
         # ORM stores state as a boolean: True for OPEN, False for CLOSED.
-        orm_issues = db.query(Issues).filter(Issues.state == (state == State.OPEN)).all()
+        query = db.query(Issues).filter(Issues.state == (state == State.OPEN))
+        orm_issues = apply_issue_sort(query, sort).all()
         return [map_issue(issue) for issue in orm_issues]
 
     @staticmethod
-    def get_issues_by_source(info, source: Source) -> List[GraphQLIssue]:
+    def get_issues_by_source(info, source: Source, sort: Optional[IssueSort] = None) -> List[GraphQLIssue]:
         db: Session = info.context["db"]
-        orm_issues = db.query(Issues).filter(Issues.source == source.value).all()
+        query = db.query(Issues).filter(Issues.source == source.value)
+        orm_issues = apply_issue_sort(query, sort).all()
         return [map_issue(issue) for issue in orm_issues]
 
     @staticmethod
-    def get_issues_by_label(info, label: str) -> List[GraphQLIssue]:
+    def get_issues_by_label(info, label: str, sort: Optional[IssueSort] = None) -> List[GraphQLIssue]:
         db: Session = info.context["db"]
-        orm_issues = db.query(Issues).filter(Issues.labels.op("@>")(cast([label], JSONB))).all()
+        query = db.query(Issues).filter(Issues.labels.op("@>")(cast([label], JSONB)))
+        orm_issues = apply_issue_sort(query, sort).all()
         return [map_issue(issue) for issue in orm_issues]
 
 @strawberry.type
@@ -135,3 +183,38 @@ class MutationResolver:
             db.rollback()
             return f"Failed to refresh issues: {str(e)}"
 
+    @strawberry.mutation
+    def upsertIssueStats(self, info, stats: List[IssueStatsInput]) -> int:
+        """
+        Stores a batch of popularity counters pushed by bookmarks-and-progress,
+        overwriting the previous values in one statement. When STATS_PUSH_TOKEN
+        is set the caller must send it in the X-Stats-Token header.
+        """
+        token = config("STATS_PUSH_TOKEN", default=None)
+        if token and info.context["request"].headers.get("X-Stats-Token") != token:
+            raise Exception("Not authorized to push issue stats")
+        if not stats:
+            return 0
+        db: Session = info.context["db"]
+        now = datetime.datetime.utcnow()
+        rows = {
+            row.issue_id: {
+                "issue_id": row.issue_id,
+                "to_do": row.to_do,
+                "in_progress": row.in_progress,
+                "completed": row.completed,
+                "dropped": row.dropped,
+                "tracking": row.to_do + row.in_progress,
+                "updated_at": now,
+            }
+            for row in stats
+        }
+        insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        stmt = insert(IssueStats).values(list(rows.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[IssueStats.issue_id],
+            set_={column: getattr(stmt.excluded, column) for column in ("to_do", "in_progress", "completed", "dropped", "tracking", "updated_at")},
+        )
+        db.execute(stmt)
+        db.commit()
+        return len(rows)
@@ -11,6 +11,9 @@ Each issue is stored as a dictionary with the following keys:
 - source: The source of the issue (github/gitlab)
 - labels: List of labels associated with the issue
 - repository_id: References the associated repository
+- to_do_count, in_progress_count, completed_count, dropped_count: How many users
+  have bookmarked the issue with each status
+- tracking_count: Users still on the issue (to do + in progress)
 """
 
 import datetime
@@ -28,6 +31,12 @@ class Source(enum.Enum):
     GITHUB = "github"
     GITLAB = "gitlab"
 
+@strawberry.enum
+class IssueSort(enum.Enum):
+    LEAST_CROWDED = "least_crowded"
+    MOST_CROWDED = "most_crowded"
+    MOST_IN_PROGRESS = "most_in_progress"
+
 @strawberry.type
 class Issue:
     id: int
@@ -41,3 +50,16 @@ class Issue:
     source: Source
     labels: List[str]
     repository_id: int
+    to_do_count: int = 0
+    in_progress_count: int = 0
+    completed_count: int = 0
+    dropped_count: int = 0
+    tracking_count: int = 0
+
+@strawberry.input
+class IssueStatsInput:
+    issue_id: int
+    to_do: int = 0
+    in_progress: int = 0
+    completed: int = 0
+    dropped: int = 0
@@ -0,0 +1,107 @@
+"""
+Record/replay of upstream API responses for integrations.http_client.
+
+    HTTP_CASSETTE_MODE=record  call the real API and save every response
+    HTTP_CASSETTE_MODE=replay  answer from saved responses, never touching the network
+    HTTP_CASSETTE_MODE=off     (default) plain calls
+
+Responses are stored gzipped under HTTP_CASSETTE_DIR, one file per request
+key: the service, endpoint, method, URL path and, for GraphQL, the query with
+whitespace collapsed plus the variables in canonical JSON. Hosts are not part
+of the key, so a cassette recorded against github.com replays for the stub and
+vice versa. Authorization and other request headers are never written.
+
+A key requested several times keeps every response in order and replays them
+in the same order (starting over after the last), so a recorded ingestion run
+is reproduced call for call. Replay waits for the recorded duration times
+HTTP_REPLAY_TIMING: 1 keeps the original timing, 0.5 halves it, 0 is instant.
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+import requests
+from requests.structures import CaseInsensitiveDict
+
+MODE = os.environ.get("HTTP_CASSETTE_MODE", "off").lower()
+CASSETTE_DIR = os.environ.get("HTTP_CASSETTE_DIR", "cassettes")
+REPLAY_TIMING = float(os.environ.get("HTTP_REPLAY_TIMING", "1"))
+# Response headers worth keeping: the rest are per-connection noise.
+KEPT_HEADERS = ("content-type", "x-ratelimit-limit", "x-ratelimit-remaining", "x-ratelimit-reset",
+                "x-ratelimit-used", "x-ratelimit-resource", "retry-after")
+
+class CassetteMiss(Exception):
+    pass
+
+_lock = threading.Lock()
+_replay_positions = defaultdict(int)
+
+def request_key(method: str, url: str, json_body=None, data=None) -> dict:
+    key = {"method": method.upper(), "path": urlsplit(url).path}
+    if isinstance(json_body, dict) and "query" in json_body:
+        key["query"] = re.sub(r"\s+", " ", json_body["query"]).strip()
+        key["variables"] = json_body.get("variables") or {}
+    elif json_body is not None:
+        key["json"] = json_body
+    elif data is not None:
+        key["data"] = data if isinstance(data, (str, dict)) else str(data)
+    return key
+
+def cassette_path(service: str, endpoint: str, key: dict) -> str:
+    digest = hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()[:16]
+    return os.path.join(CASSETTE_DIR, service, f"{endpoint}-{digest}.json.gz")
+
+def _load(path: str):
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as cassette:
+            return json.load(cassette)
+    except FileNotFoundError:
+        return None
+
+def record(service: str, endpoint: str, method: str, url: str, kwargs: dict, response, elapsed: float) -> None:
+    """Appends `response` to the cassette for this request."""
+    key = request_key(method, url, kwargs.get("json"), kwargs.get("data"))
+    path = cassette_path(service, endpoint, key)
+    entry = {
+        "status": response.status_code,
+        "headers": {name: value for name, value in response.headers.items() if name.lower() in KEPT_HEADERS},
+        "body": response.text,
+        "elapsed": round(elapsed, 6),
+    }
+    with _lock:
+        cassette = _load(path) or {"service": service, "endpoint": endpoint, "request": key, "responses": []}
+        cassette["responses"].append(entry)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as output:
+            json.dump(cassette, output)
+
+def replay(service: str, endpoint: str, method: str, url: str, kwargs: dict) -> requests.Response:
+    """Returns the next recorded response for this request, after its (scaled) recorded duration."""
+    key = request_key(method, url, kwargs.get("json"), kwargs.get("data"))
+    path = cassette_path(service, endpoint, key)
+    with _lock:
+        cassette = _load(path)
+        if not cassette or not cassette["responses"]:
+            raise CassetteMiss(f"No recorded response for {service} {endpoint} ({path})")
+        position = _replay_positions[path] % len(cassette["responses"])
+        _replay_positions[path] += 1
+    entry = cassette["responses"][position]
+    if REPLAY_TIMING > 0:
+        time.sleep(entry["elapsed"] * REPLAY_TIMING)
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response._content = entry["body"].encode("utf-8")
+    response.encoding = "utf-8"
+    response.url = url
+    return response
+
+def rewind() -> None:
+    """Restarts every cassette from its first response."""
+    with _lock:
+        _replay_positions.clear()
@@ -1,7 +1,9 @@
-import requests
 import os
+from integrations import http_client
 
-GITHUB_API_URL = "https://api.github.com/graphql"
+# Overridable so ingestion can run against server/tools/github_stub.py.
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+GITHUB_GRAPHQL_URL = f"{GITHUB_API_URL}/graphql"
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")
 
 def fetch_github_issues(owner: str, repo: str, label: str, first: int = 10):
@@ -42,7 +44,7 @@ def fetch_github_issues(owner: str, repo: str, label: str, first: int = 10):
         "Authorization": f"Bearer {GITHUB_TOKEN}",
         "Content-Type": "application/json"
     }
-    response = requests.post(GITHUB_API_URL, json={"query": query, "variables": variables}, headers=headers)
+    response = http_client.post(GITHUB_GRAPHQL_URL, service="github", endpoint="issues", json={"query": query, "variables": variables}, headers=headers)
     if response.status_code == 200:
         return response.json()
     else:
@@ -76,7 +78,7 @@ def fetch_github_labels(owner: str, repo: str, first: int = 50):
         "Authorization": f"Bearer {GITHUB_TOKEN}",
         "Content-Type": "application/json"
     }
-    response = requests.post(GITHUB_API_URL, json={"query": query, "variables": variables}, headers=headers)
+    response = http_client.post(GITHUB_GRAPHQL_URL, service="github", endpoint="labels", json={"query": query, "variables": variables}, headers=headers)
     if response.status_code == 200:
         # Return only the list of label nodes
         return response.json().get("data", {}).get("repository", {}).get("labels", {}).get("nodes", [])
@@ -115,7 +117,7 @@ def fetch_github_repositories(label: str, first: int = 10):
         "Authorization": f"Bearer {GITHUB_TOKEN}",
         "Content-Type": "application/json"
     }
-    response = requests.post(GITHUB_API_URL, json={"query": query, "variables": variables}, headers=headers)
+    response = http_client.post(GITHUB_GRAPHQL_URL, service="github", endpoint="repositories", json={"query": query, "variables": variables}, headers=headers)
     if response.status_code == 200:
         data = response.json()
         nodes = data.get("data", {}).get("search", {}).get("nodes", [])
@@ -1,7 +1,8 @@
-import requests
 import os
+from integrations import http_client
 
-GITLAB_API_URL = "https://api.gitlab.com/graphql"
+GITLAB_API_URL = os.environ.get("GITLAB_API_URL", "https://api.gitlab.com").rstrip("/")
+GITLAB_GRAPHQL_URL = f"{GITLAB_API_URL}/graphql"
 GITLAB_TOKEN = os.environ.get("gitlab_TOKEN")  # Ensure your token is set in the environment
 
 def fetch_gitlab_issues(owner: str, repo: str, label: str, first: int = 10):
@@ -39,7 +40,7 @@ def fetch_gitlab_issues(owner: str, repo: str, label: str, first: int = 10):
         "Authorization": f"Bearer {GITLAB_TOKEN}",
         "Content-Type": "application/json"
     }
-    response = requests.post(GITLAB_API_URL, json={"query": query, "variables": variables}, headers=headers)
+    response = http_client.post(GITLAB_GRAPHQL_URL, service="gitlab", endpoint="issues", json={"query": query, "variables": variables}, headers=headers)
     if response.status_code == 200:
         return response.json()
     else:
@@ -0,0 +1,37 @@
+"""
+Shared HTTP client for the GitHub and GitLab integrations.
+
+All outgoing API calls go through `post`, which reuses pooled keep-alive
+connections, records latency, status code and rate-limit headroom in the
+upstream_* Prometheus metrics, and wraps the call in a tracing span whose
+context is forwarded in the `traceparent` header. With HTTP_CASSETTE_MODE set,
+responses are recorded to or replayed from disk (see integrations.cassettes).
+"""
+import time
+import requests
+from integrations import cassettes
+from observability.metrics import record_upstream_call
+from observability.tracing import client_span, record_response
+
+session = requests.Session()
+
+def post(url: str, *, service: str, endpoint: str, headers: dict = None, **kwargs) -> requests.Response:
+    """
+    POSTs to `url` and returns the response. `service` and `endpoint` only label
+    the metrics and spans (e.g. "github", "issues") and name the cassettes.
+    """
+    headers = dict(headers or {})
+    with client_span(service, endpoint, "POST", url, headers) as span:
+        start = time.perf_counter()
+        response = None
+        try:
+            if cassettes.MODE == "replay":
+                response = cassettes.replay(service, endpoint, "POST", url, kwargs)
+                return response
+            response = session.post(url, headers=headers, **kwargs)
+            if cassettes.MODE == "record":
+                cassettes.record(service, endpoint, "POST", url, kwargs, response, time.perf_counter() - start)
+            return response
+        finally:
+            record_upstream_call(service, endpoint, response, time.perf_counter() - start)
+            record_response(span, response)
@@ -0,0 +1,39 @@
+"""add issue stats
+
+Revision ID: c41f0e6a9b27
+Revises: a0157225c3c6
+Create Date: 2026-10-19 11:48:05.731294
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f0e6a9b27'
+down_revision: Union[str, None] = 'a0157225c3c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('issue_stats',
+    sa.Column('issue_id', sa.Integer(), nullable=False),
+    sa.Column('to_do', sa.Integer(), nullable=False),
+    sa.Column('in_progress', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Integer(), nullable=False),
+    sa.Column('dropped', sa.Integer(), nullable=False),
+    sa.Column('tracking', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('issue_id')
+    )
+    op.create_index('ix_issue_stats_tracking', 'issue_stats', ['tracking', 'issue_id'], unique=False)
+    op.create_index('ix_issue_stats_in_progress', 'issue_stats', ['in_progress', 'issue_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_issue_stats_in_progress', table_name='issue_stats')
+    op.drop_index('ix_issue_stats_tracking', table_name='issue_stats')
+    op.drop_table('issue_stats')
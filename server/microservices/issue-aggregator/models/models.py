@@ -1,6 +1,7 @@
 import os
 import datetime
-from sqlalchemy import Column, Integer, String, Boolean, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Boolean, Text, DateTime, ForeignKey, JSON, Index
+from sqlalchemy.orm import relationship, foreign
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.mutable import MutableList
 from .database import Base
@@ -27,6 +28,14 @@ class Issues(Base):
     labels = Column(MutableList.as_mutable(json_type), nullable=True)
     repository_id = Column(Integer, nullable=True)
 
+    # Popularity counters pushed by bookmarks-and-progress; None until first pushed.
+    stats = relationship(
+        "IssueStats",
+        primaryjoin="Issues.id == foreign(IssueStats.issue_id)",
+        uselist=False,
+        viewonly=True,
+        lazy="selectin",
+    )
 
     def __repr__(self):
         return '<Issue %r>' % (self.title)
@@ -100,3 +109,29 @@ class IssueLabel(Base):
     def __repr__(self):
         return f"<IssueLabel(id={self.id}, issue_id={self.issue_id}, label_id={self.label_id})>"
 
+
+
+class IssueStats(Base):
+    """
+    How many users track each issue, by bookmark status. Owned by the
+    bookmarks-and-progress service, which pushes changed rows in batches
+    through the upsertIssueStats mutation.
+    """
+    __tablename__ = 'issue_stats'
+
+    issue_id = Column(Integer, primary_key=True)  # Issues.id
+    to_do = Column(Integer, default=0, nullable=False)
+    in_progress = Column(Integer, default=0, nullable=False)
+    completed = Column(Integer, default=0, nullable=False)
+    dropped = Column(Integer, default=0, nullable=False)
+    tracking = Column(Integer, default=0, nullable=False)  # to_do + in_progress: users still on it
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+    __table_args__ = (
+        # Index-backed ORDER BY for the crowdedness sorts.
+        Index('ix_issue_stats_tracking', 'tracking', 'issue_id'),
+        Index('ix_issue_stats_in_progress', 'in_progress', 'issue_id'),
+    )
+
+    def __repr__(self):
+        return f"<IssueStats(issue_id={self.issue_id}, tracking={self.tracking})>"
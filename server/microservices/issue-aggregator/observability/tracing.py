@@ -0,0 +1,189 @@
+"""
+OpenTelemetry tracing, off unless OTEL_TRACES_EXPORTER is set.
+
+With tracing on, a request produces one trace: an HTTP server span (continuing
+the caller's W3C `traceparent`, e.g. from Kong), GraphQL operation, parse,
+validate and execute spans, a span per resolver, a span per SQL statement and a
+client span per outgoing API call, which passes `traceparent` on in turn.
+
+    OTEL_TRACES_EXPORTER=otlp   send to OTEL_EXPORTER_OTLP_ENDPOINT (OTLP/HTTP)
+    OTEL_TRACES_EXPORTER=file   append JSON lines to OTEL_TRACES_FILE
+    OTEL_TRACES_EXPORTER=none   (default) no tracing, no overhead
+
+Files written by the file exporter can be summarised with
+server/tools/trace_report.py.
+"""
+import os
+import threading
+from contextlib import contextmanager
+from inspect import isawaitable
+from opentelemetry import context as otel_context, propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from sqlalchemy import event
+from strawberry.extensions import LifecycleStep
+from strawberry.extensions.tracing import OpenTelemetryExtension
+from strawberry.extensions.tracing.utils import should_skip_tracing
+
+TRACES_EXPORTER = os.environ.get("OTEL_TRACES_EXPORTER", "none").lower()
+TRACES_FILE = os.environ.get("OTEL_TRACES_FILE", "traces.jsonl")
+TRACING_ENABLED = TRACES_EXPORTER in ("otlp", "file")
+# Long statements (bulk inserts) are cut to keep spans small.
+MAX_STATEMENT_LENGTH = 2000
+
+tracer = trace.get_tracer("oss-odyssey")
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Appends one JSON object per finished span to `path`."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans) -> SpanExportResult:
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        with self._lock, open(self.path, "a") as trace_file:
+            trace_file.write(lines)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+def _exporter() -> SpanExporter:
+    if TRACES_EXPORTER == "file":
+        return JsonLinesSpanExporter(TRACES_FILE)
+    # Imported lazily so the file exporter works without the OTLP package.
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    return OTLPSpanExporter()  # Reads OTEL_EXPORTER_OTLP_ENDPOINT / _HEADERS.
+
+# --- GraphQL ---
+
+class TracingExtension(OpenTelemetryExtension):
+    """
+    strawberry's OpenTelemetry extension plus a span for the execute phase.
+
+    Resolver spans are parented to the current span (the execute span) rather
+    than to the operation span kept on the extension: the schema builds its
+    resolve middleware from the first extension instance it sees, so that
+    instance's operation span would otherwise parent every later request.
+    """
+
+    def on_execute(self):
+        parent = trace.set_span_in_context(self._span_holder[LifecycleStep.OPERATION])
+        span = self._tracer.start_span("GraphQL Execution", context=parent)
+        token = otel_context.attach(trace.set_span_in_context(span))
+        yield
+        otel_context.detach(token)
+        span.end()
+
+    async def resolve(self, _next, root, info, *args, **kwargs):
+        if should_skip_tracing(_next, info):
+            result = _next(root, info, *args, **kwargs)
+            return await result if isawaitable(result) else result
+        with tracer.start_as_current_span(f"GraphQL Resolving: {info.field_name}") as span:
+            self.add_tags(span, info, kwargs)
+            result = _next(root, info, *args, **kwargs)
+            return await result if isawaitable(result) else result
+
+def tracing_extensions() -> list:
+    return [TracingExtension] if TRACING_ENABLED else []
+
+# --- HTTP server ---
+
+class TracingMiddleware:
+    """ASGI middleware opening the server span, parented to the incoming traceparent."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        carrier = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        with tracer.start_as_current_span(
+            f"{scope['method']} {scope['path']}",
+            context=propagate.extract(carrier),
+            kind=SpanKind.SERVER,
+            attributes={"http.method": scope["method"], "http.target": scope["path"]},
+        ) as span:
+            async def send_with_status(message):
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+
+            await self.app(scope, receive, send_with_status)
+
+# --- SQLAlchemy ---
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+    span = tracer.start_span(
+        f"SQL {verb}",
+        kind=SpanKind.CLIENT,
+        attributes={
+            "db.system": conn.dialect.name,
+            "db.statement": statement[:MAX_STATEMENT_LENGTH],
+            "db.executemany": executemany,
+        },
+    )
+    conn.info.setdefault("tracing_spans", []).append(span)
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    span = conn.info["tracing_spans"].pop()
+    if cursor.rowcount is not None and cursor.rowcount >= 0:
+        span.set_attribute("db.rowcount", cursor.rowcount)
+    span.end()
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    spans = connection.info.get("tracing_spans") if connection is not None else None
+    if spans:
+        span = spans.pop()
+        span.record_exception(exception_context.original_exception)
+        span.set_status(Status(StatusCode.ERROR))
+        span.end()
+
+def instrument_engine_tracing(engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+# --- Outgoing calls ---
+
+@contextmanager
+def client_span(service: str, endpoint: str, method: str, url: str, headers: dict):
+    """
+    Wraps one outgoing HTTP call in a client span and adds `traceparent` to
+    `headers`. Yields the span so the caller can record the status code.
+    """
+    with tracer.start_as_current_span(
+        f"{service} {endpoint}",
+        kind=SpanKind.CLIENT,
+        attributes={"http.method": method, "http.url": url, "peer.service": service},
+    ) as span:
+        propagate.inject(headers)
+        yield span
+
+def record_response(span, response) -> None:
+    if response is not None:
+        span.set_attribute("http.status_code", response.status_code)
+        if response.status_code >= 400:
+            span.set_status(Status(StatusCode.ERROR))
+
+# --- Setup ---
+
+def setup_tracing(app, engine, service_name: str) -> None:
+    """Installs the tracer provider, server middleware and SQL hooks when tracing is on."""
+    if not TRACING_ENABLED:
+        return
+    resource = Resource.create({"service.name": os.environ.get("OTEL_SERVICE_NAME", service_name)})
+    provider = TracerProvider(resource=resource)
+    provider.add_span_processor(BatchSpanProcessor(_exporter()))
+    trace.set_tracer_provider(provider)
+    app.add_middleware(TracingMiddleware)
+    instrument_engine_tracing(engine)
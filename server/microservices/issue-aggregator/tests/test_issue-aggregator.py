@@ -129,6 +129,276 @@ def test_get_issue_by_id(graphql_client, db_session):
     assert data["state"] == "OPEN"
     assert data["source"] == "GITHUB"
 
+def test_get_issues_by_ids_preserves_order(graphql_client, db_session):
+    """Test that issuesByIds returns issues in input order with nulls for unknown ids."""
+    issue1 = Issues(title="First", description="First issue.", state=True, source="github")
+    issue2 = Issues(title="Second", description="Second issue.", state=True, source="gitlab")
+    db_session.add_all([issue1, issue2])
+    db_session.commit()
+
+    query = f"""
+    {{
+      issuesByIds(ids: [{issue2.id}, 999999, {issue1.id}, {issue2.id}]) {{
+        id
+        title
+      }}
+    }}
+    """
+    response = graphql_client.post("/graphql", json={"query": query})
+    result = response.json()
+    assert "errors" not in result, result.get("errors")
+    data = result["data"]["issuesByIds"]
+    assert [i and i["title"] for i in data] == ["Second", None, "First", "Second"]
+
+def test_upsert_issue_stats_and_sort_by_crowdedness(graphql_client, db_session):
+    """Test that pushed popularity counters show up on Issue and drive the crowdedness sorts."""
+    quiet = Issues(title="Quiet", description="Nobody on it.", state=True, source="github")
+    busy = Issues(title="Busy", description="Everyone on it.", state=True, source="github")
+    some = Issues(title="Some", description="A few on it.", state=True, source="github")
+    db_session.add_all([quiet, busy, some])
+    db_session.commit()
+
+    mutation = f"""
+    mutation {{
+      upsertIssueStats(stats: [
+        {{ issueId: {busy.id}, toDo: 2, inProgress: 3, completed: 1 }},
+        {{ issueId: {some.id}, toDo: 9, dropped: 4 }}
+      ])
+    }}
+    """
+    result = graphql_client.post("/graphql", json={"query": mutation}).json()
+    assert "errors" not in result, result.get("errors")
+    assert result["data"]["upsertIssueStats"] == 2
+    # A later push overwrites rather than adds.
+    mutation = f"mutation {{ upsertIssueStats(stats: [{{ issueId: {some.id}, toDo: 1 }}]) }}"
+    graphql_client.post("/graphql", json={"query": mutation})
+
+    query = "{ issuesBySource(source: GITHUB, sort: LEAST_CROWDED) { title trackingCount inProgressCount completedCount droppedCount } }"
+    result = graphql_client.post("/graphql", json={"query": query}).json()
+    assert "errors" not in result, result.get("errors")
+    issues = result["data"]["issuesBySource"]
+    assert [i["title"] for i in issues] == ["Quiet", "Some", "Busy"]
+    assert issues[0]["trackingCount"] == 0
+    assert issues[1] == {"title": "Some", "trackingCount": 1, "inProgressCount": 0, "completedCount": 0, "droppedCount": 0}
+    assert issues[2]["trackingCount"] == 5
+
+    query = "{ issues(sort: MOST_CROWDED) { title } }"
+    result = graphql_client.post("/graphql", json={"query": query}).json()
+    assert [i["title"] for i in result["data"]["issues"]] == ["Busy", "Some", "Quiet"]
+
+def test_metrics_endpoint_reports_resolvers_and_sql(graphql_client, db_session):
+    """Test that /metrics exposes resolver latency and SQL statement counts after a query."""
+    from observability.metrics import instrument_engine
+    instrument_engine(engine)  # The test session's engine, not the app's.
+
+    graphql_client.post("/graphql", json={"query": "query ListIssues { issues { id } }"})
+    response = graphql_client.get("/metrics")
+    assert response.status_code == 200
+    body = response.text
+    assert 'graphql_operation_duration_seconds_count{operation_name="ListIssues",operation_type="query"}' in body
+    assert 'graphql_resolver_duration_seconds_count{field="Query.issues"}' in body
+    assert 'db_statements_total{statement="SELECT"}' in body
+    # Plain attribute fields aren't timed.
+    assert 'field="Issue.id"' not in body
+
+def test_tracing_spans_nest_sql_under_resolvers(db_session):
+    """Test that a traced operation yields phase, resolver and SQL spans in one trace."""
+    import asyncio
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    from graphql_server import Query, Mutation
+    from observability.tracing import TracingExtension, instrument_engine_tracing
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    instrument_engine_tracing(engine)
+
+    db_session.add(Issues(title="Traced", description="Traced issue.", state=True, source="github"))
+    db_session.commit()
+    traced_schema = strawberry.Schema(query=Query, mutation=Mutation, extensions=[TracingExtension])
+    result = asyncio.run(traced_schema.execute("{ issues { id title } }", context_value={"db": db_session}))
+    assert result.errors is None
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    names = ("GraphQL Parsing", "GraphQL Validation", "GraphQL Execution", "GraphQL Resolving: issues", "SQL SELECT")
+    for name in names:
+        assert name in spans, sorted(spans)
+    assert len({spans[name].context.trace_id for name in names}) == 1
+    assert spans["SQL SELECT"].parent.span_id == spans["GraphQL Resolving: issues"].context.span_id
+    assert spans["GraphQL Resolving: issues"].parent.span_id == spans["GraphQL Execution"].context.span_id
+
+def test_server_timing_header(graphql_client, db_session):
+    """Test that /graphql responses carry a Server-Timing header with every phase and the SQL count."""
+    from observability.server_timing import instrument_engine_timing
+    instrument_engine_timing(engine)  # The test session's engine, not the app's.
+
+    response = graphql_client.post("/graphql", json={"query": "{ issues { id } }"})
+    header = response.headers["Server-Timing"]
+    phases = [part.strip().split(";")[0] for part in header.split(",")]
+    assert phases == ["parse", "validate", "resolve", "db", "serialize"]
+    assert 'desc="1 query"' in header
+    assert response.headers["Timing-Allow-Origin"] == "*"
+
+def test_issue_lists_stay_within_query_budget(graphql_client, db_session):
+    """Test that list queries load issues and their stats in a fixed number of statements, not one per issue."""
+    from observability.query_budget import assert_max_queries
+    db_session.add_all([
+        Issues(title=f"Issue {n}", description="Budgeted issue.", state=True, source="github") for n in range(10)
+    ])
+    db_session.commit()
+    ids = [issue.id for issue in db_session.query(Issues).all()]
+
+    with assert_max_queries(engine, 2):
+        result = graphql_client.post("/graphql", json={"query": "{ issues { id title trackingCount } }"}).json()
+    assert len(result["data"]["issues"]) == 10
+    with assert_max_queries(engine, 2):
+        query = f"{{ issuesByIds(ids: {ids}) {{ id inProgressCount }} }}"
+        result = graphql_client.post("/graphql", json={"query": query}).json()
+    assert len(result["data"]["issuesByIds"]) == 10
+
+def test_query_budget_extension_raises_in_raise_mode(db_session, monkeypatch):
+    """Test that an operation over its query budget, or repeating one statement, fails in raise mode."""
+    from graphql_server import Query, Mutation
+    from observability import query_budget
+    monkeypatch.setattr(query_budget, "QUERY_BUDGET_MODE", "raise")
+    monkeypatch.setattr(query_budget, "QUERY_BUDGET", 2)
+    query_budget.instrument_engine_budget(engine)
+
+    db_session.add(Issues(title="Counted", description="Counted issue.", state=True, source="github"))
+    db_session.commit()
+    budget_schema = strawberry.Schema(query=Query, mutation=Mutation, extensions=[query_budget.QueryBudgetExtension])
+    result = budget_schema.execute_sync("query Cheap { issues { id } }", context_value={"db": db_session})
+    assert result.errors is None
+    # Each list is one SELECT for the issues plus one for their stats.
+    costly = "query Costly { issues { id } issuesBySource(source: GITHUB) { id } }"
+    result = budget_schema.execute_sync(costly, context_value={"db": db_session})
+    assert "Operation Costly ran 4 SQL statements (budget 2)" in result.errors[0].message
+
+    recorder = query_budget.QueryRecorder()
+    for issue_id in range(5):
+        recorder.record(f"SELECT * FROM issues WHERE id = {issue_id}")
+    recorder.record("SELECT * FROM issues WHERE id IN (?, ?, ?)")
+    recorder.record("SELECT * FROM issues WHERE id IN (?)")
+    assert recorder.repeated() == [("SELECT * FROM issues WHERE id = ?", 5)]
+    assert recorder.shapes["SELECT * FROM issues WHERE id IN (?)"] == 2
+
+def test_slow_query_log_captures_plans(graphql_client, db_session, monkeypatch):
+    """Test that slow statements are kept with parameters and a plan, behind the admin token."""
+    from observability import admin, slow_queries
+    monkeypatch.setattr(slow_queries, "SLOW_QUERY_MS", 0)
+    monkeypatch.setattr(slow_queries, "SLOW_QUERY_EXPLAIN_SAMPLE", 1.0)
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+    slow_queries.instrument_engine_slow_queries(engine)  # The test session's engine, not the app's.
+    slow_queries.slow_query_log.clear()
+
+    issue = Issues(title="Slow", description="Slow issue.", state=True, source="github")
+    db_session.add(issue)
+    db_session.commit()
+    graphql_client.post("/graphql", json={"query": f"{{ issue(id: {issue.id}) {{ title }} }}"})
+    slow_queries.slow_query_log.wait()
+
+    assert graphql_client.get("/admin/slow-queries").status_code == 403
+    response = graphql_client.get("/admin/slow-queries", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    entries = [e for e in response.json()["queries"] if "FROM issues" in e["statement"] and e["parameters"]]
+    assert entries, response.json()
+    parameters = entries[0]["parameters"]
+    assert issue.id in (parameters.values() if isinstance(parameters, dict) else parameters)
+    assert entries[0]["plan"] and "error" not in entries[0]["plan"]
+
+def test_profile_endpoints_return_collapsed_stacks(graphql_client, db_session, monkeypatch):
+    """Test that timed and per-request profiles come back as flamegraph collapsed stacks."""
+    import re
+    from observability import admin
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secret")
+
+    assert graphql_client.get("/admin/profile?seconds=0.1").status_code == 403
+    response = graphql_client.get("/admin/profile?seconds=0.2&interval_ms=2", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    assert int(response.headers["X-Profile-Samples"]) > 0
+    lines = response.text.splitlines()
+    assert lines and all(re.fullmatch(r"\S.* \d+", line) for line in lines)
+
+    db_session.add_all([Issues(title=f"Issue {n}", description="Profiled.", state=True, source="github") for n in range(200)])
+    db_session.commit()
+    response = graphql_client.post(
+        "/graphql",
+        json={"query": "{ issues { id title description } }"},
+        headers={"X-Profile": "1", "X-Admin-Token": "secret"},
+    )
+    assert response.headers["X-Profiled-Status"] == "200"
+    assert response.headers["content-type"].startswith("text/plain")
+    # Without the token the header is ignored.
+    response = graphql_client.post("/graphql", json={"query": "{ issues { id } }"}, headers={"X-Profile": "1"})
+    assert len(response.json()["data"]["issues"]) == 200
+
+@pytest.fixture
+def github_stub():
+    """Runs server/tools/github_stub.py on a free local port and yields its base URL."""
+    import importlib.util
+    import socket
+    import threading
+    import time
+    import uvicorn
+    path = os.path.join(os.path.dirname(__file__), "..", "..", "..", "tools", "github_stub.py")
+    if not os.path.exists(path):
+        pytest.skip("server/tools is not part of this checkout")
+    spec = importlib.util.spec_from_file_location("github_stub", path)
+    stub = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(stub)
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(stub.create_app(stub.StubConfig(issues_per_repo=40)), port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join()
+
+def test_refresh_issues_against_github_stub(graphql_client, db_session, github_stub, monkeypatch):
+    """Test that ingestion runs offline against the GitHub stub through an overridden base URL."""
+    from integrations import github_integration
+    monkeypatch.setattr(github_integration, "GITHUB_GRAPHQL_URL", f"{github_stub}/graphql")
+
+    result = graphql_client.post("/graphql", json={"query": "mutation { refreshIssues }"}).json()
+    assert result["data"]["refreshIssues"] == "Issues refreshed successfully"
+    issues = db_session.query(Issues).all()
+    assert len(issues) == 10  # fetch_github_issues asks for the first 10.
+    assert all("good first issue" in issue.labels for issue in issues)
+    # The stub is deterministic: a second refresh stores the same issues.
+    graphql_client.post("/graphql", json={"query": "mutation { refreshIssues }"})
+    assert sorted(i.external_id for i in db_session.query(Issues).all()) == sorted(i.external_id for i in issues)
+
+def test_cassettes_record_then_replay_offline(graphql_client, db_session, github_stub, monkeypatch, tmp_path):
+    """Test that recorded upstream responses replay in order with the network gone."""
+    from integrations import cassettes, github_integration
+    monkeypatch.setattr(cassettes, "CASSETTE_DIR", str(tmp_path))
+    monkeypatch.setattr(cassettes, "MODE", "record")
+    monkeypatch.setattr(github_integration, "GITHUB_GRAPHQL_URL", f"{github_stub}/graphql")
+    recorded = github_integration.fetch_github_issues("apache", "airflow", "good first issue")
+    github_integration.fetch_github_labels("apache", "airflow")
+    files = list(tmp_path.rglob("*.json.gz"))
+    assert sorted(path.name.split("-")[0] for path in files) == ["issues", "labels"]
+
+    monkeypatch.setattr(cassettes, "MODE", "replay")
+    monkeypatch.setattr(cassettes, "REPLAY_TIMING", 0)
+    # Nothing listens here: every call has to come from the cassettes.
+    monkeypatch.setattr(github_integration, "GITHUB_GRAPHQL_URL", "http://127.0.0.1:9/graphql")
+    cassettes.rewind()
+    assert github_integration.fetch_github_issues("apache", "airflow", "good first issue") == recorded
+    result = graphql_client.post("/graphql", json={"query": "mutation { refreshIssues }"}).json()
+    assert result["data"]["refreshIssues"] == "Issues refreshed successfully"
+    assert db_session.query(Issues).count() == 10
+    with pytest.raises(cassettes.CassetteMiss):
+        github_integration.fetch_github_issues("apache", "airflow", "bug")
+
 def test_refresh_issues(graphql_client, db_session):
     """
     Test refreshing issues from GitHub.
@@ -537,3 +807,56 @@ def test_create_delete_issue_label_association(graphql_client, db_session):
     result = response.json()
     assert "errors" not in result
     assert "deleted successfully" in result["data"]["deleteIssueLabelAssociation"]
+
+# --- Query plans (PostgreSQL only) ---
+
+# The cost limits below are calibrated for this many synthetic issues.
+PLAN_TEST_ISSUES = 50000
+NO_INDEX_YET = pytest.mark.xfail(reason="column not indexed yet", strict=True)
+HOT_QUERY_PLANS = [
+    # (query, index the resolver's own statement must use, limit on its estimated cost)
+    pytest.param('{ issuesByLabel(label: "documentation") { id } }', "ix_issues_labels", 1800,
+                 marks=NO_INDEX_YET, id="issuesByLabel"),
+    pytest.param("{ issuesBySource(source: GITLAB) { id } }", "ix_issues_source", 1800,
+                 marks=NO_INDEX_YET, id="issuesBySource"),
+    pytest.param("{ projectsByOwner(ownerId: 500) { projectId } }", "ix_projects_owner_id", 50,
+                 marks=NO_INDEX_YET, id="projectsByOwner"),
+    pytest.param("{ userIssuesByProject(projectId: 5) { issueId } }", "ix_user_issues_project_id", 50,
+                 marks=NO_INDEX_YET, id="userIssuesByProject"),
+    pytest.param("{ labelsByRepository(repositoryId: 7) { labelId } }", "ix_labels_repository_id", 50,
+                 marks=NO_INDEX_YET, id="labelsByRepository"),
+]
+
+@pytest.fixture(scope="module")
+def seeded_postgres():
+    """Loads PLAN_TEST_ISSUES synthetic issues (server/tools/synthetic_data.py) into the test database."""
+    import subprocess
+    import sys
+    if engine.dialect.name != "postgresql" or os.getenv("TESTING") == "1":
+        pytest.skip("query-plan tests need TEST_DATABASE_URL on PostgreSQL and TESTING unset")
+    path = os.path.join(os.path.dirname(__file__), "..", "..", "..", "tools", "synthetic_data.py")
+    if not os.path.exists(path):
+        pytest.skip("server/tools is not part of this checkout")
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    subprocess.run(
+        [sys.executable, path, f"--issues={PLAN_TEST_ISSUES}", f"--users={PLAN_TEST_ISSUES * 2 // 5}",
+         "--issue-db", TEST_DATABASE_URL],
+        check=True, capture_output=True,
+    )
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("VACUUM ANALYZE")
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.mark.parametrize("query, index, max_cost", HOT_QUERY_PLANS)
+def test_hot_query_plans(seeded_postgres, query, index, max_cost):
+    """Test that each hot resolver's statement is planned as an index or bitmap scan within its cost limit."""
+    from sqlalchemy.orm import Session
+    from observability.query_plans import assert_plan, capture_statements
+    with Session(engine) as db, capture_statements(engine) as statements:
+        result = schema.execute_sync(query, context_value={"db": db})
+    assert result.errors is None
+    # The first statement is the resolver's; any others load relationships by primary key.
+    statement, parameters = statements[0]
+    assert_plan(engine, statement, parameters, index=index, max_cost=max_cost)
@@ -10,12 +10,15 @@ async def get_context(request: Request):
     return {"request": request, "db": db, "user_id": user_id}
 
 import strawberry
-from strawberry.fastapi import GraphQLRouter
 from graphql_server.schemas.user_schema import User
 from graphql_server.schemas.auth_schema import Token, RegisterInput, LoginInput
 from graphql_server.resolvers.user_resolver import UserQueryResolver, UserMutationResolver
 from graphql_server.resolvers.auth_resolver import AuthMutationResolver
 from fastapi import Depends
+from observability.metrics import MetricsExtension
+from observability.tracing import tracing_extensions
+from observability.server_timing import ServerTimingExtension, TimedGraphQLRouter
+from observability.query_budget import query_budget_extensions
 
 # Instantiate resolver classes
 user_query_resolver = UserQueryResolver()
@@ -35,5 +38,5 @@ class Mutation:
     update_user: User = strawberry.mutation(resolver=UserMutationResolver.updateUser)
     delete_user: User = strawberry.mutation(resolver=UserMutationResolver.deleteUser)
 
-schema = strawberry.Schema(query=Query, mutation=Mutation)
-graphql_app = GraphQLRouter(schema, context_getter=get_context)
+schema = strawberry.Schema(query=Query, mutation=Mutation, extensions=[MetricsExtension, ServerTimingExtension, *query_budget_extensions(), *tracing_extensions()])
+graphql_app = TimedGraphQLRouter(schema, context_getter=get_context)
@@ -1,4 +1,5 @@
 import os
+import time
 import datetime
 import jwt
 import strawberry
@@ -10,9 +11,14 @@ from passlib.context import CryptContext
 from graphql_server.schemas.auth_schema import RegisterInput, LoginInput, Token
 from graphql_server.schemas.user_schema import User as GraphQLUser
 from models.models import User as ORMUser
+from observability.metrics import record_upstream_call
+from observability.tracing import client_span, record_response
 
 GITHUB_CLIENT_ID = os.environ.get("GITHUB_CLIENT_ID")
 GITHUB_CLIENT_SECRET = os.environ.get("GITHUB_CLIENT_SECRET")
+# Overridable so the OAuth flow can run against server/tools/github_stub.py.
+GITHUB_URL = os.environ.get("GITHUB_URL", "https://github.com").rstrip("/")
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "your-secret-key")
@@ -21,6 +27,19 @@ ALGORITHM = "HS256"
 def get_user_by_email(db: Session, email: str):
     return db.query(ORMUser).filter(ORMUser.email == email).first()
 
+def github_request(method: str, url: str, endpoint: str, headers: dict = None, **kwargs) -> requests.Response:
+    """Calls GitHub, recording latency, status and rate-limit headroom under `endpoint`."""
+    headers = dict(headers or {})
+    with client_span("github", endpoint, method, url, headers) as span:
+        start = time.perf_counter()
+        response = None
+        try:
+            response = requests.request(method, url, headers=headers, **kwargs)
+            return response
+        finally:
+            record_upstream_call("github", endpoint, response, time.perf_counter() - start)
+            record_response(span, response)
+
 @strawberry.type
 class AuthMutationResolver:
     @strawberry.mutation
@@ -65,14 +84,14 @@ class AuthMutationResolver:
         db: Session = info.context["db"]
 
         # Exchange the code for an access token
-        token_url = "https://github.com/login/oauth/access_token"
+        token_url = f"{GITHUB_URL}/login/oauth/access_token"
         headers = {"Accept": "application/json", "Content-Type": "application/x-www-form-urlencoded"}
         data = {
             "client_id": GITHUB_CLIENT_ID,
             "client_secret": GITHUB_CLIENT_SECRET,
             "code": code
         }
-        response = requests.post(token_url, headers=headers, data=data)
+        response = github_request("POST", token_url, "oauth_access_token", headers=headers, data=data)
         token_data = response.json()
 
         if "access_token" not in token_data:
@@ -81,15 +100,15 @@ class AuthMutationResolver:
         access_token = token_data["access_token"]
 
         # Get GitHub user details
-        user_url = "https://api.github.com/user"
+        user_url = f"{GITHUB_API_URL}/user"
         user_headers = {"Authorization": f"token {access_token}"}
-        user_response = requests.get(user_url, headers=user_headers)
+        user_response = github_request("GET", user_url, "user", headers=user_headers)
         github_user = user_response.json()
 
         if "email" not in github_user or not github_user["email"]:
             # Optionally, fetch emails if email is not public
-            emails_url = "https://api.github.com/user/emails"
-            emails_response = requests.get(emails_url, headers=user_headers)
+            emails_url = f"{GITHUB_API_URL}/user/emails"
+            emails_response = github_request("GET", emails_url, "user_emails", headers=user_headers)
             if emails_response.status_code == 200:
                 emails = emails_response.json()
                 primary_email = next((e["email"] for e in emails if e.get("primary")), None)
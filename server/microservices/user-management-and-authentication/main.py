@@ -12,8 +12,22 @@ from graphql_server import graphql_app
 from middleware.auth import authMiddleware
 from webhooks.webhook import router as webhook_router
 from webhooks.oauth_callback import router as oauth_callback_router
+from models.database import engine
+from observability.metrics import instrument_engine, metrics_endpoint
+from observability.tracing import setup_tracing
+from observability.server_timing import instrument_engine_timing
+from observability.query_budget import instrument_engine_budget
+from observability.slow_queries import instrument_engine_slow_queries
+from observability.admin import ProfileRequestMiddleware, router as admin_router
+
+instrument_engine(engine)
+instrument_engine_timing(engine)
+instrument_engine_budget(engine)
+instrument_engine_slow_queries(engine)
 
 app = FastAPI()
+setup_tracing(app, engine, "user-management")
+app.add_middleware(ProfileRequestMiddleware)
 
 # Add the `authMiddleware` to the list of middleware
 app.middleware(authMiddleware)
@@ -26,6 +40,10 @@ app.include_router(oauth_callback_router)
 def read_root():
     return {"message": "Welcome to the user authenticator API."}
 
+# Prometheus scrape endpoint
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+app.include_router(admin_router)
+
 # Add the `/graphql` route and set the `graphql_app` as its route handler
 app.include_router(graphql_app, prefix="/graphql")
 
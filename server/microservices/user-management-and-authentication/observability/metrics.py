@@ -0,0 +1,185 @@
+"""
+Prometheus metrics for the service, exposed on GET /metrics.
+
+- graphql_operation_duration_seconds: one observation per GraphQL request,
+  labelled by operation name and type.
+- graphql_resolver_duration_seconds: time spent in fields that have their own
+  resolver (plain attribute fields are skipped to keep the overhead down).
+- db_statements_total / db_statement_duration_seconds: every SQL statement the
+  engine sends, labelled by its leading keyword (SELECT, INSERT, ...).
+- db_pool_connections: connection-pool state, read when /metrics is scraped.
+- upstream_*: latency, status codes and rate-limit headroom of the GitHub
+  calls made during OAuth login, recorded by the githubAuth resolver.
+
+The issue-aggregator's benchmarks/metrics_overhead.py measures what the same
+instrumentation costs per request.
+"""
+import inspect
+import time
+from typing import Optional
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY, CONTENT_TYPE_LATEST, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from starlette.requests import Request
+from starlette.responses import Response
+from strawberry.extensions import SchemaExtension
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+GRAPHQL_OPERATION_SECONDS = Histogram(
+    "graphql_operation_duration_seconds",
+    "Time to execute a GraphQL operation",
+    ["operation_name", "operation_type"],
+    buckets=LATENCY_BUCKETS,
+)
+GRAPHQL_RESOLVER_SECONDS = Histogram(
+    "graphql_resolver_duration_seconds",
+    "Time spent in a GraphQL field resolver",
+    ["field"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_STATEMENTS = Counter(
+    "db_statements_total",
+    "SQL statements executed",
+    ["statement"],
+)
+DB_STATEMENT_SECONDS = Histogram(
+    "db_statement_duration_seconds",
+    "Time to execute a SQL statement",
+    ["statement"],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_REQUEST_SECONDS = Histogram(
+    "upstream_request_duration_seconds",
+    "Latency of calls to upstream APIs",
+    ["service", "endpoint"],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_RESPONSES = Counter(
+    "upstream_responses_total",
+    "Responses from upstream APIs by status code ('error' when no response came back)",
+    ["service", "endpoint", "status"],
+)
+UPSTREAM_RATE_LIMIT_REMAINING = Gauge(
+    "upstream_rate_limit_remaining",
+    "Requests left in the upstream API's current rate-limit window",
+    ["service", "resource"],
+)
+
+# --- GraphQL ---
+
+_timed_fields = {}
+
+def _resolver_label(info) -> Optional[str]:
+    """Returns "Type.field" for fields with a custom resolver, else None (cached per field)."""
+    key = (info.parent_type.name, info.field_name)
+    label = _timed_fields.get(key, False)
+    if label is False:
+        definition = info.parent_type.fields[info.field_name].extensions.get("strawberry-definition")
+        has_resolver = definition is not None and definition.base_resolver is not None
+        label = _timed_fields[key] = f"{key[0]}.{key[1]}" if has_resolver else None
+    return label
+
+async def _observe_awaitable(result, label: str, start: float):
+    try:
+        return await result
+    finally:
+        GRAPHQL_RESOLVER_SECONDS.labels(label).observe(time.perf_counter() - start)
+
+class MetricsExtension(SchemaExtension):
+    """Records operation and resolver latency histograms."""
+
+    def on_operation(self):
+        start = time.perf_counter()
+        yield
+        context = self.execution_context
+        try:
+            operation_type = context.operation_type.value
+        except Exception:
+            # The document didn't parse, so there is no operation type.
+            operation_type = "invalid"
+        GRAPHQL_OPERATION_SECONDS.labels(context.operation_name or "anonymous", operation_type).observe(
+            time.perf_counter() - start
+        )
+
+    def resolve(self, _next, root, info, *args, **kwargs):
+        label = _resolver_label(info)
+        if label is None:
+            return _next(root, info, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            result = _next(root, info, *args, **kwargs)
+        except Exception:
+            GRAPHQL_RESOLVER_SECONDS.labels(label).observe(time.perf_counter() - start)
+            raise
+        if inspect.isawaitable(result):
+            return _observe_awaitable(result, label, start)
+        GRAPHQL_RESOLVER_SECONDS.labels(label).observe(time.perf_counter() - start)
+        return result
+
+# --- SQLAlchemy ---
+
+def _statement_label(statement: str) -> str:
+    head = statement.lstrip().split(None, 1)
+    return head[0].upper() if head else "EMPTY"
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["metrics_query_start"].pop()
+    label = _statement_label(statement)
+    DB_STATEMENTS.labels(label).inc()
+    DB_STATEMENT_SECONDS.labels(label).observe(elapsed)
+
+def _handle_error(exception_context):
+    # after_cursor_execute doesn't fire for failed statements; drop their start time.
+    starts = exception_context.connection.info.get("metrics_query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+class PoolCollector:
+    """Reports the pool state of every instrumented engine at scrape time (NullPool has nothing to report)."""
+
+    def __init__(self):
+        self.engines = []
+
+    def collect(self):
+        gauge = GaugeMetricFamily(
+            "db_pool_connections", "Connections in the SQLAlchemy pool by state", labels=["database", "state"]
+        )
+        for engine in self.engines:
+            for state in ("size", "checkedin", "checkedout", "overflow"):
+                reader = getattr(engine.pool, state, None)
+                if callable(reader):
+                    gauge.add_metric([engine.url.database or "", state], reader())
+        yield gauge
+
+pool_collector = PoolCollector()
+REGISTRY.register(pool_collector)
+
+def instrument_engine(engine) -> None:
+    """Hooks SQL statement counters and pool gauges onto `engine`. Safe to call twice."""
+    if engine in pool_collector.engines:
+        return
+    pool_collector.engines.append(engine)
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+# --- Upstream APIs ---
+
+def record_upstream_call(service: str, endpoint: str, response, seconds: float) -> None:
+    """Records one outgoing API call; `response` is None when the request itself failed."""
+    UPSTREAM_REQUEST_SECONDS.labels(service, endpoint).observe(seconds)
+    status = str(response.status_code) if response is not None else "error"
+    UPSTREAM_RESPONSES.labels(service, endpoint, status).inc()
+    remaining = response.headers.get("X-RateLimit-Remaining") if response is not None else None
+    if remaining is not None and remaining.isdigit():
+        resource = response.headers.get("X-RateLimit-Resource", "core")
+        UPSTREAM_RATE_LIMIT_REMAINING.labels(service, resource).set(int(remaining))
+
+# --- Endpoint ---
+
+def metrics_endpoint(request: Request) -> Response:
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
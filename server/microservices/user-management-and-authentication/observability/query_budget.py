@@ -0,0 +1,119 @@
+"""
+Query budget and N+1 detector for GraphQL operations.
+
+Every SQL statement run while an operation executes is counted against that
+operation, and statements are grouped by shape (the SQL text with literals and
+expanded IN lists collapsed). An operation that runs more than QUERY_BUDGET
+statements, or runs the same shape QUERY_REPEAT_THRESHOLD times or more (the
+usual sign of a per-row lazy load), is reported:
+
+    QUERY_BUDGET_MODE=off    (default) no counting
+    QUERY_BUDGET_MODE=warn   log a warning naming the operation and the shapes
+    QUERY_BUDGET_MODE=raise  fail the operation with a GraphQL error
+
+Tests can assert a bound directly with `assert_max_queries(engine, n)`.
+"""
+import logging
+import os
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from strawberry.extensions import SchemaExtension
+
+QUERY_BUDGET_MODE = os.environ.get("QUERY_BUDGET_MODE", "off").lower()
+QUERY_BUDGET = int(os.environ.get("QUERY_BUDGET", "20"))
+QUERY_REPEAT_THRESHOLD = int(os.environ.get("QUERY_REPEAT_THRESHOLD", "5"))
+
+logger = logging.getLogger(__name__)
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(\?|%\([^)]*\)s|%s|\$\d+|:\w+)(\s*,\s*(\?|%\([^)]*\)s|%s|\$\d+|:\w+))+\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+
+def statement_shape(statement: str) -> str:
+    """Normalises a statement so the same query with different values compares equal."""
+    shape = _WHITESPACE.sub(" ", statement.strip())
+    shape = _STRING.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    return _PLACEHOLDER_LIST.sub("(?)", shape)
+
+class QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.shapes = Counter()
+        self.statements = []
+
+    def record(self, statement: str) -> None:
+        self.count += 1
+        self.shapes[statement_shape(statement)] += 1
+        self.statements.append(statement)
+
+    def repeated(self, threshold: Optional[int] = None) -> list:
+        """(shape, times) for shapes run at least `threshold` times, most frequent first."""
+        threshold = threshold or QUERY_REPEAT_THRESHOLD
+        return [(shape, times) for shape, times in self.shapes.most_common() if times >= threshold]
+
+current_recorder: ContextVar[Optional[QueryRecorder]] = ContextVar("query_recorder", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    recorder = current_recorder.get()
+    if recorder is not None:
+        recorder.record(statement)
+
+def instrument_engine_budget(engine) -> None:
+    """Counts the engine's statements into the running operation's recorder. Safe to call twice."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+
+class QueryBudgetExtension(SchemaExtension):
+    """Counts the statements of one operation and reports budget or N+1 violations."""
+
+    def on_execute(self):
+        recorder = QueryRecorder()
+        token = current_recorder.set(recorder)
+        yield
+        current_recorder.reset(token)
+        problems = []
+        if recorder.count > QUERY_BUDGET:
+            problems.append(f"ran {recorder.count} SQL statements (budget {QUERY_BUDGET})")
+        for shape, times in recorder.repeated():
+            problems.append(f"ran the same statement {times} times, possible N+1: {shape[:300]}")
+        if not problems:
+            return
+        message = f"Operation {self.execution_context.operation_name or '<anonymous>'} " + "; ".join(problems)
+        if QUERY_BUDGET_MODE == "raise":
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+def query_budget_extensions() -> list:
+    return [QueryBudgetExtension] if QUERY_BUDGET_MODE != "off" else []
+
+@contextmanager
+def record_queries(engine):
+    """Records every statement `engine` runs inside the block, whatever the mode."""
+    recorder = QueryRecorder()
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        recorder.record(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        yield recorder
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+@contextmanager
+def assert_max_queries(engine, limit: int):
+    """Fails if the block runs more than `limit` statements on `engine`."""
+    with record_queries(engine) as recorder:
+        yield recorder
+    if recorder.count > limit:
+        listing = "\n".join(f"  {statement}" for statement in recorder.statements)
+        raise AssertionError(f"Expected at most {limit} SQL statements, ran {recorder.count}:\n{listing}")
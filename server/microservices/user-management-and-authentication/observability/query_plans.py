@@ -0,0 +1,72 @@
+"""
+Query-plan assertions for regression tests on PostgreSQL.
+
+A migration or an ORM change can rewrite a resolver's SQL so that it stops
+using its index, and nothing fails: the query only gets slower as the table
+grows. Tests capture the statements a resolver runs and check the planner's
+choice against a seeded, ANALYZEd database:
+
+    with capture_statements(engine) as statements:
+        schema.execute_sync('{ projectsByOwner(ownerId: 500) { projectId } }', context_value={"db": db})
+    statement, parameters = statements[0]
+    assert_plan(engine, statement, parameters, index="ix_projects_owner_id", max_cost=50)
+
+Only plans are compared (EXPLAIN without ANALYZE), so the checks are
+deterministic for a given dataset and never execute the statement.
+"""
+from contextlib import contextmanager
+from sqlalchemy import event
+
+INDEX_NODE_TYPES = ("Index Scan", "Index Only Scan", "Bitmap Index Scan")
+
+@contextmanager
+def capture_statements(engine):
+    """Collects (statement, parameters) for every SELECT `engine` runs inside the block."""
+    statements = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip()[:6].upper().startswith(("SELECT", "WITH")):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+def explain(engine, statement: str, parameters=None) -> dict:
+    """The root plan node of `statement`, from EXPLAIN (FORMAT JSON)."""
+    with engine.connect() as conn:
+        [result] = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+    return result["Plan"]
+
+def plan_nodes(plan: dict):
+    """Every node of the plan tree, depth first."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+def indexes_used(plan: dict) -> set:
+    return {node["Index Name"] for node in plan_nodes(plan) if node["Node Type"] in INDEX_NODE_TYPES}
+
+def describe(plan: dict, depth: int = 0) -> str:
+    """An indented outline of the plan, like EXPLAIN's text format, for failure messages."""
+    target = plan.get("Index Name") or plan.get("Relation Name")
+    line = "  " * depth + plan["Node Type"] + (f" on {target}" if target else "")
+    line += f"  (cost={plan['Startup Cost']}..{plan['Total Cost']} rows={plan['Plan Rows']})"
+    return "\n".join([line, *(describe(child, depth + 1) for child in plan.get("Plans", []))])
+
+def assert_plan(engine, statement: str, parameters=None, *, index: str, max_cost: float) -> dict:
+    """
+    Fails unless the plan reads through `index` (an index, index-only or bitmap
+    scan) and its estimated total cost is at most `max_cost`. Returns the plan.
+    """
+    plan = explain(engine, statement, parameters)
+    problems = []
+    if index not in indexes_used(plan):
+        problems.append(f"does not use {index}")
+    if plan["Total Cost"] > max_cost:
+        problems.append(f"costs {plan['Total Cost']} (limit {max_cost})")
+    if problems:
+        raise AssertionError(f"Plan {' and '.join(problems)}:\n{describe(plan)}\n\n{statement}")
+    return plan
@@ -0,0 +1,288 @@
+"""
+Local stand-in for the GitHub (and GitLab) APIs, for offline ingestion runs,
+benchmarks and load tests.
+
+Serves deterministic data for the calls the services make:
+
+- POST /graphql: the repository issues, repository labels and repository
+  search queries in issue-aggregator/integrations. Lists honour `first`
+  (max 100) and `after`, and every response carries `pageInfo`, `totalCount`
+  and a `rateLimit` object.
+- POST /login/oauth/access_token, GET /user, GET /user/emails: the OAuth flow
+  in user-management's githubAuth. Any code is accepted except "bad"; one user
+  in five has no public email, so the /user/emails fallback gets exercised.
+- GET /rate_limit, and GET /stats for request counts by endpoint and status.
+
+Latency, transient 502s and the per-token rate limit are configurable, and
+seeded so two runs with the same flags see the same sequence. Point the
+services at it with
+
+    GITHUB_API_URL=http://localhost:9000 GITHUB_URL=http://localhost:9000 GITLAB_API_URL=http://localhost:9000
+
+    python server/tools/github_stub.py [--port 9000] [--latency-ms 80] [--jitter-ms 30]
+        [--error-rate 0.01] [--rate-limit 5000] [--issues-per-repo 250] [--seed 42]
+
+Every flag can also be set through the matching STUB_* environment variable
+(STUB_PORT, STUB_LATENCY_MS, ...).
+"""
+import argparse
+import asyncio
+import base64
+import datetime
+import hashlib
+import os
+import random
+import time
+from collections import Counter
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+LABEL_NAMES = [
+    "good first issue", "help wanted", "bug", "enhancement", "documentation", "beginner", "easy",
+    "hacktoberfest", "first-timers-only", "up-for-grabs", "tests", "refactor", "question",
+]
+LANGUAGES = ["Python", "JavaScript", "TypeScript", "Go", "Rust", "Java", "C++", "Ruby"]
+MAX_PAGE_SIZE = 100
+EPOCH = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+
+class StubConfig:
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, rate_limit=5000,
+                 rate_limit_window=3600, issues_per_repo=250, repos_per_search=1000, seed=42):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.issues_per_repo = issues_per_repo
+        self.repos_per_search = repos_per_search
+        self.seed = seed
+
+def _rng(*parts) -> random.Random:
+    return random.Random(hashlib.sha256(":".join(map(str, parts)).encode()).hexdigest())
+
+def _cursor(offset: int) -> str:
+    return base64.b64encode(f"cursor:{offset}".encode()).decode()
+
+def _offset(cursor) -> int:
+    if not cursor:
+        return 0
+    try:
+        return int(base64.b64decode(cursor).decode().split(":", 1)[1])
+    except Exception:
+        return 0
+
+def _timestamp(rng: random.Random) -> str:
+    moment = EPOCH - datetime.timedelta(seconds=rng.randrange(365 * 24 * 3600))
+    return moment.isoformat().replace("+00:00", "Z")
+
+def _page(total: int, variables: dict):
+    first = max(0, min(int(variables.get("first") or 10), MAX_PAGE_SIZE))
+    start = _offset(variables.get("after"))
+    end = min(total, start + first)
+    page_info = {
+        "hasNextPage": end < total,
+        "endCursor": _cursor(end) if end > start else None,
+        "hasPreviousPage": start > 0,
+        "startCursor": _cursor(start) if end > start else None,
+    }
+    return range(start, end), page_info
+
+# --- Data ---
+
+def issue_node(config: StubConfig, owner: str, repo: str, number: int) -> dict:
+    rng = _rng(config.seed, owner, repo, "issue", number)
+    labels = sorted({LABEL_NAMES[min(int(rng.paretovariate(1.3)) - 1, len(LABEL_NAMES) - 1)] for _ in range(rng.randint(1, 3))})
+    created = _timestamp(rng)
+    return {
+        "id": base64.b64encode(f"I_{owner}/{repo}#{number}".encode()).decode(),
+        "number": number,
+        "title": f"{repo}: synthetic issue {number}",
+        "body": f"Steps to reproduce issue {number} in {owner}/{repo}. " * rng.randint(1, 8),
+        "createdAt": created,
+        "updatedAt": created,
+        "url": f"https://github.com/{owner}/{repo}/issues/{number}",
+        "labels": {"nodes": [{"name": name} for name in labels]},
+    }
+
+def repository_issues(config: StubConfig, variables: dict) -> dict:
+    owner, repo = variables.get("owner", "octocat"), variables.get("repo", "hello-world")
+    wanted = set(variables.get("label") or [])
+    # Each label matches a fixed, deterministic share of the repository's issues.
+    numbers = [
+        number for number in range(1, config.issues_per_repo + 1)
+        if not wanted or wanted & {label["name"] for label in issue_node(config, owner, repo, number)["labels"]["nodes"]}
+    ]
+    indexes, page_info = _page(len(numbers), variables)
+    language = LANGUAGES[_rng(config.seed, owner, repo).randrange(len(LANGUAGES))]
+    edges = [
+        {"cursor": _cursor(index + 1), "node": issue_node(config, owner, repo, numbers[index])}
+        for index in indexes
+    ]
+    return {
+        "repository": {
+            "primaryLanguage": {"name": language},
+            "issues": {"totalCount": len(numbers), "pageInfo": page_info, "edges": edges},
+        }
+    }
+
+def repository_labels(config: StubConfig, variables: dict) -> dict:
+    owner, repo = variables.get("owner", "octocat"), variables.get("repo", "hello-world")
+    count = _rng(config.seed, owner, repo, "labels").randint(3, len(LABEL_NAMES))
+    indexes, page_info = _page(count, variables)
+    nodes = [
+        {"name": LABEL_NAMES[index], "color": f"{_rng(config.seed, LABEL_NAMES[index]).randrange(0xFFFFFF):06x}",
+         "description": f"Issues labelled {LABEL_NAMES[index]}"}
+        for index in indexes
+    ]
+    return {"repository": {"labels": {"totalCount": count, "pageInfo": page_info, "nodes": nodes}}}
+
+def repository_search(config: StubConfig, variables: dict) -> dict:
+    topic = (variables.get("query") or "").replace("topic:", "").strip() or "any"
+    indexes, page_info = _page(config.repos_per_search, variables)
+    nodes = []
+    for index in indexes:
+        rng = _rng(config.seed, "search", topic, index)
+        owner, name = f"org{rng.randrange(200)}", f"{topic}-project-{index}"
+        nodes.append({
+            "id": base64.b64encode(f"R_{owner}/{name}".encode()).decode(),
+            "name": name,
+            "nameWithOwner": f"{owner}/{name}",
+            "description": f"A {topic} project",
+            "url": f"https://github.com/{owner}/{name}",
+            "primaryLanguage": {"name": LANGUAGES[rng.randrange(len(LANGUAGES))]} if rng.random() < 0.9 else None,
+        })
+    return {"search": {"repositoryCount": config.repos_per_search, "pageInfo": page_info, "nodes": nodes}}
+
+def github_user(config: StubConfig, token: str) -> dict:
+    user_number = int(hashlib.sha256(token.encode()).hexdigest()[:8], 16) % 10000000
+    return {
+        "login": f"stub-user-{user_number}",
+        "id": user_number,
+        "name": f"Stub User {user_number}",
+        # One user in five hides their email, as many real accounts do.
+        "email": None if user_number % 5 == 0 else f"stub-user-{user_number}@example.com",
+    }
+
+# --- App ---
+
+def create_app(config: StubConfig) -> FastAPI:
+    app = FastAPI(title="GitHub API stub")
+    chaos = random.Random(config.seed)
+    usage = {}  # token -> (window start, requests used)
+    stats = Counter()
+
+    def rate_limit(request: Request):
+        """Charges one request to the caller's token; returns (remaining, reset epoch)."""
+        token = request.headers.get("Authorization", "anonymous")
+        now = time.time()
+        window_start, used = usage.get(token, (now, 0))
+        if now - window_start >= config.rate_limit_window:
+            window_start, used = now, 0
+        used += 1
+        usage[token] = (window_start, used)
+        return max(0, config.rate_limit - used), int(window_start + config.rate_limit_window), used > config.rate_limit
+
+    async def respond(request: Request, endpoint: str, body):
+        """Applies latency, failures and rate limiting around `body` (a dict, list or callable)."""
+        if config.latency_ms or config.jitter_ms:
+            await asyncio.sleep(max(0.0, chaos.gauss(config.latency_ms, config.jitter_ms)) / 1000)
+        remaining, reset, exceeded = rate_limit(request)
+        headers = {
+            "X-RateLimit-Limit": str(config.rate_limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(reset),
+            "X-RateLimit-Used": str(config.rate_limit - remaining),
+            "X-RateLimit-Resource": "graphql" if endpoint.startswith("graphql") else "core",
+        }
+        if exceeded:
+            status, payload = 403, {"message": "API rate limit exceeded", "documentation_url": "https://docs.github.com/rest/rate-limit"}
+        elif chaos.random() < config.error_rate:
+            status, payload = 502, {"message": "Server Error"}
+        else:
+            status, payload = 200, body(remaining, reset) if callable(body) else body
+        stats[f"{endpoint} {status}"] += 1
+        return JSONResponse(payload, status_code=status, headers=headers)
+
+    @app.post("/graphql")
+    async def graphql(request: Request):
+        payload = await request.json()
+        query, variables = payload.get("query", ""), payload.get("variables") or {}
+        if "search(" in query:
+            endpoint, resolver = "graphql.search", repository_search
+        elif "issues(" in query:
+            endpoint, resolver = "graphql.issues", repository_issues
+        elif "labels(" in query:
+            endpoint, resolver = "graphql.labels", repository_labels
+        else:
+            stats["graphql.unknown 200"] += 1
+            return JSONResponse({"errors": [{"message": "The stub does not know this query"}]})
+
+        def body(remaining, reset):
+            data = resolver(config, variables)
+            reset_at = datetime.datetime.fromtimestamp(reset, datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+            data["rateLimit"] = {"limit": config.rate_limit, "cost": 1, "remaining": remaining, "resetAt": reset_at}
+            return {"data": data}
+
+        return await respond(request, endpoint, body)
+
+    @app.post("/login/oauth/access_token")
+    async def access_token(request: Request):
+        form = await request.form()
+        code = form.get("code", "")
+        if code == "bad":
+            return await respond(request, "oauth", {"error": "bad_verification_code"})
+        return await respond(request, "oauth", {"access_token": f"gho_stub_{code}", "token_type": "bearer", "scope": "user:email"})
+
+    @app.get("/user")
+    async def user(request: Request):
+        token = request.headers.get("Authorization", "").split(" ")[-1]
+        return await respond(request, "user", github_user(config, token))
+
+    @app.get("/user/emails")
+    async def user_emails(request: Request):
+        token = request.headers.get("Authorization", "").split(" ")[-1]
+        login = github_user(config, token)["login"]
+        return await respond(request, "user_emails", [
+            {"email": f"{login}@users.noreply.github.com", "primary": False, "verified": True},
+            {"email": f"{login}@example.com", "primary": True, "verified": True},
+        ])
+
+    @app.get("/rate_limit")
+    async def rate_limit_status(request: Request):
+        token = request.headers.get("Authorization", "anonymous")
+        window_start, used = usage.get(token, (time.time(), 0))
+        core = {"limit": config.rate_limit, "used": used, "remaining": max(0, config.rate_limit - used),
+                "reset": int(window_start + config.rate_limit_window)}
+        return {"resources": {"core": core, "graphql": core}, "rate": core}
+
+    @app.get("/stats")
+    async def request_stats():
+        return dict(stats)
+
+    return app
+
+def main():
+    env = os.environ.get
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default=env("STUB_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(env("STUB_PORT", "9000")))
+    parser.add_argument("--latency-ms", type=float, default=float(env("STUB_LATENCY_MS", "0")))
+    parser.add_argument("--jitter-ms", type=float, default=float(env("STUB_JITTER_MS", "0")))
+    parser.add_argument("--error-rate", type=float, default=float(env("STUB_ERROR_RATE", "0")), help="share of 502s")
+    parser.add_argument("--rate-limit", type=int, default=int(env("STUB_RATE_LIMIT", "5000")), help="requests per token and window")
+    parser.add_argument("--rate-limit-window", type=int, default=int(env("STUB_RATE_LIMIT_WINDOW", "3600")), help="seconds")
+    parser.add_argument("--issues-per-repo", type=int, default=int(env("STUB_ISSUES_PER_REPO", "250")))
+    parser.add_argument("--repos-per-search", type=int, default=int(env("STUB_REPOS_PER_SEARCH", "1000")))
+    parser.add_argument("--seed", type=int, default=int(env("STUB_SEED", "42")))
+    args = parser.parse_args()
+
+    import uvicorn
+    config = StubConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        rate_limit=args.rate_limit, rate_limit_window=args.rate_limit_window,
+        issues_per_repo=args.issues_per_repo, repos_per_search=args.repos_per_search, seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
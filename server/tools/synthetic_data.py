@@ -0,0 +1,367 @@
+"""
+Generates and bulk-loads a deterministic synthetic dataset into the three
+services' databases, for load tests and benchmarks.
+
+The data is shaped like production rather than uniform:
+
+- users: most have a GitHub OAuth credential; bookmark counts per user are
+  Pareto-distributed, so a few heavy users track thousands of issues.
+- repositories: a long tail, where a few repositories own most issues.
+- labels: each repository has a prefix of a popularity-ordered label list, and
+  issues pick labels with a Zipf-like skew ("good first issue" dominates).
+- bookmarks: popular issues are bookmarked far more often than the rest;
+  user_progress, issue_progress and issue_stats are derived from them, so the
+  counters agree with the rows.
+
+The same --seed gives the same rows whichever services are loaded. Tables must
+exist (run each service's `alembic upgrade head`) and be empty, or pass
+--truncate. PostgreSQL is loaded with COPY, other databases with chunked
+executemany; 10M rows take a few minutes on PostgreSQL.
+
+    python server/tools/synthetic_data.py --users 100000 --issues 1000000 \\
+        --issue-db $ISSUE_DB_URL --bookmarks-db $BOOKMARKS_DB_URL --users-db $USER_DB_URL
+"""
+import argparse
+import csv
+import datetime
+import io
+import json
+import os
+import random
+import time
+from collections import defaultdict
+from sqlalchemy import MetaData, create_engine, func, insert, select, text
+
+LABEL_NAMES = [
+    "good first issue", "help wanted", "bug", "enhancement", "documentation", "beginner", "easy",
+    "hacktoberfest", "first-timers-only", "up-for-grabs", "tests", "refactor", "question", "ui", "performance",
+]
+LABEL_COLORS = ["7057ff", "008672", "d73a4a", "a2eeef", "0075ca", "e4e669", "cfd3d7"]
+LANGUAGES = ["Python", "JavaScript", "TypeScript", "Go", "Rust", "Java", "C++", "Ruby", "PHP", "C#"]
+BOOKMARK_STATUSES = ["to_do", "in_progress", "completed", "dropped"]
+BOOKMARK_STATUS_WEIGHTS = [45, 20, 25, 10]
+PROJECT_ISSUE_STATUSES = ["backlog", "in_progress", "completed", "archived", "dropped"]
+# Heavy users are capped so a single user stays loadable through the API.
+MAX_BOOKMARKS_PER_USER = 5000
+EXECUTEMANY_CHUNK = 10000
+COPY_CHUNK = 100000
+EPOCH = datetime.datetime(2025, 1, 1)
+
+def _rng(seed: int, table: str) -> random.Random:
+    """One generator per table, so a table's rows don't depend on what else is generated."""
+    return random.Random(f"{seed}:{table}")
+
+def _timestamp(rng: random.Random) -> datetime.datetime:
+    return EPOCH - datetime.timedelta(seconds=rng.randrange(365 * 24 * 3600))
+
+def _skewed(rng: random.Random, count: int, skew: float = 3.0) -> int:
+    """A 1-based index in [1, count] where low indices are far more likely."""
+    return 1 + min(count - 1, int(count * rng.random() ** skew))
+
+# --- user-management-and-authentication ---
+
+def users(seed: int, count: int):
+    rng = _rng(seed, "users")
+    for n in range(1, count + 1):
+        created = _timestamp(rng)
+        yield {
+            "id": n, "username": f"user{n}", "email": f"user{n}@example.com",
+            # Not a valid hash of anything, so synthetic users can't log in with a password.
+            "hashed_password": "!synthetic", "is_active": rng.random() < 0.97,
+            "created_at": created, "updated_at": created,
+        }
+
+def oauth_credentials(seed: int, user_count: int):
+    rng = _rng(seed, "oauth_credentials")
+    credential_id = 0
+    for user_id in range(1, user_count + 1):
+        if rng.random() < 0.9:
+            credential_id += 1
+            yield {
+                "id": credential_id, "provider": "github", "provider_user_id": str(5000000 + user_id),
+                "access_token": f"gho_synthetic{user_id:012d}", "user_id": user_id,
+            }
+
+# --- bookmarks-and-progress ---
+
+def bookmarks(seed: int, user_count: int, issue_count: int, per_user: float, counters: dict):
+    """Bookmark rows; fills counters["user"] and counters["issue"] with per-status totals."""
+    rng = _rng(seed, "bookmarks")
+    alpha = 1.3
+    base = per_user * (alpha - 1) / alpha  # Pareto(alpha) has mean alpha / (alpha - 1).
+    bookmark_id = 0
+    for user_id in range(1, user_count + 1):
+        count = min(issue_count, MAX_BOOKMARKS_PER_USER, int(base * rng.paretovariate(alpha)))
+        if count > issue_count // 2:
+            issue_ids = rng.sample(range(1, issue_count + 1), count)
+        else:
+            chosen = set()
+            while len(chosen) < count:
+                chosen.add(_skewed(rng, issue_count))
+            issue_ids = sorted(chosen)
+        for issue_id in issue_ids:
+            bookmark_id += 1
+            status = rng.choices(BOOKMARK_STATUSES, BOOKMARK_STATUS_WEIGHTS)[0]
+            created = _timestamp(rng)
+            counters["user"][user_id][status] += 1
+            counters["issue"][issue_id][status] += 1
+            yield {
+                "id": bookmark_id, "user_id": user_id, "issue_id": issue_id, "status": status,
+                "pr_link": f"https://github.com/example/repo/pull/{bookmark_id}" if status == "completed" else None,
+                "created_at": created, "updated_at": created + datetime.timedelta(days=rng.randrange(30)),
+            }
+
+def progress_rows(counters: dict, key: str, extra: dict):
+    for owner_id in sorted(counters):
+        row = {key: owner_id, "updated_at": EPOCH, **extra}
+        row.update({status: counters[owner_id].get(status, 0) for status in BOOKMARK_STATUSES})
+        yield row
+
+# --- issue-aggregator ---
+
+def repositories(seed: int, count: int):
+    rng = _rng(seed, "repositories")
+    for n in range(1, count + 1):
+        owner = f"org{_skewed(rng, max(1, count // 5), 2.0)}"
+        yield {
+            "id": n, "external_id": str(9000000 + n), "name": f"project-{n}", "full_name": f"{owner}/project-{n}",
+            "description": f"Synthetic repository {n}", "url": f"https://github.com/{owner}/project-{n}",
+            "source": "gitlab" if rng.random() < 0.15 else "github",
+            "language": LANGUAGES[_skewed(rng, len(LANGUAGES), 1.5) - 1],
+        }
+
+def repository_label_counts(seed: int, repository_count: int) -> list:
+    """How many of LABEL_NAMES (a prefix, most popular first) each repository defines."""
+    rng = _rng(seed, "repository_labels")
+    return [rng.randint(3, len(LABEL_NAMES)) for _ in range(repository_count)]
+
+def labels(label_counts: list):
+    label_id = 0
+    for repository_id, count in enumerate(label_counts, start=1):
+        for name in LABEL_NAMES[:count]:
+            label_id += 1
+            yield {
+                "id": label_id, "name": name, "color": LABEL_COLORS[label_id % len(LABEL_COLORS)],
+                "description": f"Issues labelled {name}", "repository_id": repository_id,
+            }
+
+def issues(seed: int, count: int, label_counts: list, issue_labels: dict):
+    """Issue rows; records each issue's (repository_id, label indexes) in `issue_labels`."""
+    rng = _rng(seed, "issues")
+    for n in range(1, count + 1):
+        repository_id = _skewed(rng, len(label_counts), 4.0)
+        available = label_counts[repository_id - 1]
+        chosen = sorted({_skewed(rng, available, 2.5) - 1 for _ in range(rng.randint(1, 3))})
+        issue_labels[n] = (repository_id, chosen)
+        created = _timestamp(rng)
+        yield {
+            "id": n, "external_id": 100000000 + n, "title": f"Synthetic issue {n}",
+            "description": f"Generated issue {n} for load testing.", "state": rng.random() < 0.75,
+            "created_at": created, "updated_at": created + datetime.timedelta(days=rng.randrange(60)),
+            "url": f"https://github.com/example/project-{repository_id}/issues/{n}",
+            "source": "gitlab" if rng.random() < 0.15 else "github",
+            "labels": [LABEL_NAMES[index] for index in chosen], "repository_id": repository_id,
+        }
+
+def issue_label_rows(label_counts: list, issue_labels: dict):
+    first_label_id, next_id = [], 1
+    for count in label_counts:
+        first_label_id.append(next_id)
+        next_id += count
+    association_id = 0
+    for issue_id, (repository_id, chosen) in issue_labels.items():
+        for index in chosen:
+            association_id += 1
+            yield {"id": association_id, "issue_id": issue_id, "label_id": first_label_id[repository_id - 1] + index}
+
+def projects(seed: int, count: int, user_count: int, repository_count: int):
+    rng = _rng(seed, "projects")
+    for n in range(1, count + 1):
+        created = _timestamp(rng)
+        repository_id = _skewed(rng, repository_count, 2.0)
+        yield {
+            "id": n, "name": f"Contribution plan {n}", "description": "Synthetic project",
+            "url": f"https://github.com/example/project-{repository_id}", "source": "github",
+            "repository_id": repository_id, "owner_id": _skewed(rng, user_count, 2.0),
+            "created_at": created, "updated_at": created,
+        }
+
+def project_issues(seed: int, project_count: int, issue_count: int):
+    rng = _rng(seed, "project_issues")
+    row_id = 0
+    for project_id in range(1, project_count + 1):
+        for _ in range(rng.randint(1, 10)):
+            row_id += 1
+            created = _timestamp(rng)
+            yield {
+                "id": row_id, "issue": _skewed(rng, issue_count), "project_id": project_id,
+                "status": PROJECT_ISSUE_STATUSES[_skewed(rng, len(PROJECT_ISSUE_STATUSES), 1.5) - 1],
+                "pr_link": f"https://github.com/example/repo/pull/{row_id}", "created_at": created, "updated_at": created,
+            }
+
+def issue_stats_rows(issue_counters: dict):
+    for row in progress_rows(issue_counters, "issue_id", {}):
+        row["tracking"] = row["to_do"] + row["in_progress"]
+        yield row
+
+# --- Loading ---
+
+class Loader:
+    """Loads rows into one database's existing tables."""
+
+    def __init__(self, url: str, truncate: bool):
+        self.engine = create_engine(url)
+        self.metadata = MetaData()
+        self.metadata.reflect(bind=self.engine)
+        self.truncate = truncate
+
+    def table(self, name: str):
+        if name not in self.metadata.tables:
+            raise SystemExit(f"{self.engine.url.render_as_string()}: table {name} is missing, run `alembic upgrade head` first")
+        return self.metadata.tables[name]
+
+    def prepare(self, names: list) -> None:
+        with self.engine.begin() as conn:
+            for name in names:
+                table = self.table(name)
+                if self.truncate:
+                    if self.engine.dialect.name == "postgresql":
+                        # CASCADE also empties tables the services add on top, e.g. oauth_credentials.
+                        conn.execute(text(f'TRUNCATE TABLE "{name}" CASCADE'))
+                    else:
+                        conn.execute(table.delete())
+                elif conn.execute(select(func.count()).select_from(table)).scalar():
+                    raise SystemExit(f"{name} is not empty; pass --truncate to replace its rows")
+
+    def load(self, name: str, rows) -> int:
+        table = self.table(name)
+        start = time.perf_counter()
+        if self.engine.dialect.name == "postgresql":
+            count = self._copy(table, rows)
+            if "id" in table.c:
+                with self.engine.begin() as conn:
+                    # Rows carry explicit ids; move the sequence past them for later inserts.
+                    conn.execute(text(
+                        f"SELECT setval(pg_get_serial_sequence('{name}', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM \"{name}\""
+                    ))
+        else:
+            count = self._executemany(table, rows)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<20}{count:>12,} rows {elapsed:>8.1f}s {count / elapsed if elapsed else 0:>12,.0f} rows/s")
+        return count
+
+    def _executemany(self, table, rows) -> int:
+        count, batch = 0, []
+        with self.engine.begin() as conn:
+            for row in rows:
+                batch.append(row)
+                if len(batch) == EXECUTEMANY_CHUNK:
+                    conn.execute(insert(table), batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                conn.execute(insert(table), batch)
+                count += len(batch)
+        return count
+
+    def _copy(self, table, rows) -> int:
+        columns = None
+        raw = self.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            buffer, count, pending = io.StringIO(), 0, 0
+            writer = csv.writer(buffer)
+
+            def flush():
+                buffer.seek(0)
+                cursor.copy_expert(
+                    f'COPY "{table.name}" ({", ".join(columns)}) FROM STDIN WITH (FORMAT csv)', buffer
+                )
+                buffer.seek(0)
+                buffer.truncate()
+
+            for row in rows:
+                if columns is None:
+                    columns = list(row)
+                writer.writerow([_copy_value(row[column]) for column in columns])
+                count += 1
+                pending += 1
+                if pending == COPY_CHUNK:
+                    flush()
+                    pending = 0
+            if pending:
+                flush()
+            raw.commit()
+        finally:
+            raw.close()
+        return count
+
+def _copy_value(value):
+    # COPY's CSV format reads an unquoted empty field as NULL.
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--issues", type=int, default=100000)
+    parser.add_argument("--repositories", type=int, help="default: issues / 50")
+    parser.add_argument("--bookmarks-per-user", type=float, default=25.0, help="mean; the distribution is heavy-tailed")
+    parser.add_argument("--projects", type=int, help="default: users / 5")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--issue-db", default=os.environ.get("ISSUE_DB_URL"))
+    parser.add_argument("--bookmarks-db", default=os.environ.get("BOOKMARKS_DB_URL"))
+    parser.add_argument("--users-db", default=os.environ.get("USER_DB_URL"))
+    parser.add_argument("--truncate", action="store_true", help="replace existing rows")
+    args = parser.parse_args()
+    if not (args.issue_db or args.bookmarks_db or args.users_db):
+        parser.error("give at least one of --issue-db, --bookmarks-db, --users-db")
+    repository_count = args.repositories or max(1, args.issues // 50)
+    project_count = args.projects or max(1, args.users // 5)
+    start = time.perf_counter()
+
+    if args.users_db:
+        print(f"user-management: {args.users} users")
+        loader = Loader(args.users_db, args.truncate)
+        loader.prepare(["oauth_credentials", "users"])
+        loader.load("users", users(args.seed, args.users))
+        loader.load("oauth_credentials", oauth_credentials(args.seed, args.users))
+
+    counters = {"user": defaultdict(lambda: defaultdict(int)), "issue": defaultdict(lambda: defaultdict(int))}
+    bookmark_rows = bookmarks(args.seed, args.users, args.issues, args.bookmarks_per_user, counters)
+    if args.bookmarks_db:
+        print(f"bookmarks-and-progress: ~{int(args.users * args.bookmarks_per_user)} bookmarks")
+        loader = Loader(args.bookmarks_db, args.truncate)
+        loader.prepare(["user_issues", "user_progress", "issue_progress"])
+        loader.load("user_issues", bookmark_rows)
+        loader.load("user_progress", progress_rows(counters["user"], "user_id", {}))
+        # Marked clean: issue_stats below is loaded with the same counts.
+        loader.load("issue_progress", progress_rows(counters["issue"], "issue_id", {"dirty": False}))
+    elif args.issue_db:
+        for _ in bookmark_rows:  # issue_stats is derived from the bookmarks.
+            pass
+
+    if args.issue_db:
+        print(f"issue-aggregator: {args.issues} issues in {repository_count} repositories")
+        loader = Loader(args.issue_db, args.truncate)
+        loader.prepare(["repositories", "labels", "issues", "issue_label", "projects", "user_issues", "issue_stats"])
+        label_counts = repository_label_counts(args.seed, repository_count)
+        issue_labels = {}
+        loader.load("repositories", repositories(args.seed, repository_count))
+        loader.load("labels", labels(label_counts))
+        loader.load("issues", issues(args.seed, args.issues, label_counts, issue_labels))
+        loader.load("issue_label", issue_label_rows(label_counts, issue_labels))
+        loader.load("projects", projects(args.seed, project_count, args.users, repository_count))
+        loader.load("user_issues", project_issues(args.seed, project_count, args.issues))
+        loader.load("issue_stats", issue_stats_rows(counters["issue"]))
+    print(f"done in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Summarises spans written by the services' file trace exporter
+(OTEL_TRACES_EXPORTER=file) to attribute slow requests.
+
+Reads one or more JSON-lines files (one per service is fine, spans are joined
+on trace id), computes request latency percentiles from the root spans and,
+for the requests at or above the chosen percentile, shows where the time went:
+self time per span name, summed over those traces.
+
+    python server/tools/trace_report.py traces/*.jsonl [--percentile 99] [--top 15]
+"""
+import argparse
+import json
+import statistics
+from collections import defaultdict
+from datetime import datetime
+
+def parse_time(value: str) -> float:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+def load_spans(paths: list[str]) -> dict:
+    """Returns {trace_id: [span dict, ...]} with start/end in epoch seconds."""
+    traces = defaultdict(list)
+    for path in paths:
+        with open(path) as trace_file:
+            for line in trace_file:
+                if not line.strip():
+                    continue
+                raw = json.loads(line)
+                traces[raw["context"]["trace_id"]].append({
+                    "id": raw["context"]["span_id"],
+                    "parent": raw.get("parent_id"),
+                    "name": raw["name"],
+                    "service": raw.get("resource", {}).get("attributes", {}).get("service.name", "?"),
+                    "start": parse_time(raw["start_time"]),
+                    "end": parse_time(raw["end_time"]),
+                })
+    return traces
+
+def self_times(spans: list[dict]) -> dict:
+    """Time spent in each span minus its direct children, keyed by "service: name"."""
+    children = defaultdict(float)
+    for span in spans:
+        if span["parent"]:
+            children[span["parent"]] += span["end"] - span["start"]
+    totals = defaultdict(float)
+    for span in spans:
+        own = max(span["end"] - span["start"] - children[span["id"]], 0.0)
+        totals[f"{span['service']}: {span['name']}"] += own
+    return totals
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--percentile", type=float, default=99)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    traces = load_spans(args.files)
+    durations = {}
+    for trace_id, spans in traces.items():
+        ids = {span["id"] for span in spans}
+        # Roots are spans whose parent isn't in the files (e.g. Kong's span, or none).
+        roots = [span for span in spans if span["parent"] not in ids]
+        durations[trace_id] = max(span["end"] for span in roots) - min(span["start"] for span in roots)
+    if not durations:
+        print("No spans found")
+        return
+
+    values = list(durations.values())
+    print(f"{len(values)} traces: p50 {percentile(values, 50) * 1000:.1f} ms, "
+          f"p95 {percentile(values, 95) * 1000:.1f} ms, p99 {percentile(values, 99) * 1000:.1f} ms, "
+          f"max {max(values) * 1000:.1f} ms")
+
+    threshold = percentile(values, args.percentile)
+    slow = [trace_id for trace_id, duration in durations.items() if duration >= threshold]
+    totals = defaultdict(float)
+    for trace_id in slow:
+        for name, seconds in self_times(traces[trace_id]).items():
+            totals[name] += seconds
+    total = sum(totals.values()) or 1.0
+    print(f"\n{len(slow)} traces at or above p{args.percentile:g} ({threshold * 1000:.1f} ms), self time by span:")
+    for name, seconds in sorted(totals.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {seconds / len(slow) * 1000:>9.2f} ms/trace  {seconds / total:>6.1%}  {name}")
+    print(f"\nSlowest traces: {', '.join(sorted(slow, key=lambda t: -durations[t])[:5])}")
+
+if __name__ == "__main__":
+    main()